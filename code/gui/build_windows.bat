@@ -27,6 +27,7 @@ pyinstaller --onefile ^
     --hidden-import "customtkinter" ^
     --hidden-import "serial" ^
     --hidden-import "serial.tools.list_ports" ^
+    --collect-submodules "pynput" ^
     sippuff_gui.py
 
 echo.
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Nutzungsstatistik
+Laufende Aggregate aus ACTION-Events und Druck-Samples, gespeichert als
+kompakte Tages-Buckets in ~/.sippuff/analytics/
+
+Pro Event wird nur ein Zähler erhöht. Abgeschlossene Sitzungen werden in
+daily.json (ein Eintrag pro Tag) eingerechnet und als eine Zeile an
+sessions.jsonl angehängt. Abfragen über Monate lesen nur die Tages-Buckets.
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+CLICK_TYPES = ('LEFT_CLICK', 'DOUBLE_CLICK', 'RIGHT_CLICK')
+CLICK_COLORS = {'LEFT_CLICK': "#B20D30", 'DOUBLE_CLICK': "#E67E22", 'RIGHT_CLICK': "#3498DB"}
+CLICK_NAMES = {'LEFT_CLICK': "Links", 'DOUBLE_CLICK': "Doppel", 'RIGHT_CLICK': "Rechts"}
+
+MISFIRE_WINDOW = 1.5        # Korrektur innerhalb 1,5 s = Verdacht auf Fehlklick
+# Korrekturmuster (vorheriger Klick, Folgeklick). Andere Folgen sind gewollt,
+# z.B. die Geste "Einfügen" (Puff -> Sip = Links -> Rechts).
+MISFIRE_PATTERNS = {
+    ('RIGHT_CLICK', 'LEFT_CLICK'),   # Ungewolltes Kontextmenü wird per Linksklick geschlossen
+    ('LEFT_CLICK', 'DOUBLE_CLICK'),  # Doppelklick gewollt, beim Anblasen Linksklick-Schwelle ausgelöst
+}
+PRESSURE_ACTIVE = 5         # Samples ab |5| zählen als Atemaktivität
+CHECKPOINT_INTERVAL_MS = 60000
+
+
+def empty_bucket():
+    bucket = {click: 0 for click in CLICK_TYPES}
+    bucket.update({'misfires': 0, 'seconds': 0.0, 'sessions': 0,
+                   'pressure_sum': 0, 'pressure_count': 0})
+    return bucket
+
+
+def merge_bucket(target, source):
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+    return target
+
+
+class SessionAggregate:
+    """Laufende Aggregate einer Sitzung, nach Tagen getrennt"""
+
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.buckets = {}
+        self.last_click = None  # (Typ, Zeit) für die Fehlklick-Erkennung
+
+    def bucket(self, t):
+        day = date.fromtimestamp(t).isoformat()
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = self.buckets[day] = empty_bucket()
+        return bucket
+
+    def add_click(self, t, click):
+        bucket = self.bucket(t)
+        bucket[click] += 1
+
+        # Korrektur direkt danach: der vorherige Klick war vermutlich ungewollt
+        if self.last_click is not None:
+            last_type, last_t = self.last_click
+            if (last_type, click) in MISFIRE_PATTERNS and t - last_t <= MISFIRE_WINDOW:
+                self.bucket(last_t)['misfires'] += 1
+        self.last_click = (click, t)
+
+    def add_pressure(self, t, value):
+        if abs(value) >= PRESSURE_ACTIVE:
+            bucket = self.bucket(t)
+            bucket['pressure_sum'] += abs(value)
+            bucket['pressure_count'] += 1
+
+    def close(self, ended_at):
+        """Schließt die Sitzung ab: Dauer und Sitzungszähler im Start-Tag"""
+        bucket = self.bucket(self.started_at)
+        bucket['seconds'] += max(ended_at - self.started_at, 0.0)
+        bucket['sessions'] += 1
+        return self.buckets
+
+    def to_dict(self, ended_at):
+        return {'start': self.started_at, 'end': ended_at, 'buckets': self.buckets}
+
+
+class AnalyticsStore:
+    """
+    Stream-Abonnent der GUI und Speicher der Tages-Buckets.
+
+    start_session()/end_session() umschließen eine Verbindung. checkpoint()
+    sichert die laufende Sitzung in current_session.json; eine dort liegen
+    gebliebene Sitzung (Absturz) wird beim nächsten Start nachgetragen.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.daily_path = os.path.join(directory, "daily.json")
+        self.sessions_path = os.path.join(directory, "sessions.jsonl")
+        self.current_path = os.path.join(directory, "current_session.json")
+
+        self.lock = threading.Lock()
+        self.session = None
+        self.daily = self._load_daily()
+        self._recover()
+
+    def _load_daily(self):
+        if os.path.exists(self.daily_path):
+            try:
+                with open(self.daily_path, 'r') as f:
+                    return json.load(f)
+            except ValueError as e:
+                print(f"⚠ Fehler beim Laden der Statistik: {e}")
+        return {}
+
+    def _recover(self):
+        if not os.path.exists(self.current_path):
+            return
+        try:
+            with open(self.current_path, 'r') as f:
+                stale = json.load(f)
+            session = SessionAggregate(stale['start'])
+            session.buckets = stale['buckets']
+            self._commit(session, stale['end'])
+        except (ValueError, KeyError):
+            pass
+        os.remove(self.current_path)
+
+    # Sitzungen
+
+    def start_session(self):
+        with self.lock:
+            if self.session is None:
+                self.session = SessionAggregate(time.time())
+
+    def end_session(self):
+        with self.lock:
+            session, self.session = self.session, None
+        if session is not None:
+            self._commit(session, time.time())
+            if os.path.exists(self.current_path):
+                os.remove(self.current_path)
+
+    def checkpoint(self):
+        """Sichert die laufende Sitzung (Aufruf aus dem GUI-Thread)"""
+        with self.lock:
+            if self.session is None:
+                return
+            snapshot = json.dumps(self.session.to_dict(time.time()))
+        self._write_atomic(self.current_path, snapshot)
+
+    def _commit(self, session, ended_at):
+        buckets = session.close(ended_at)
+        with self.lock:
+            for day, bucket in buckets.items():
+                merge_bucket(self.daily.setdefault(day, empty_bucket()), bucket)
+            daily = json.dumps(self.daily, separators=(',', ':'))
+        self._write_atomic(self.daily_path, daily)
+        with open(self.sessions_path, 'a') as f:
+            f.write(json.dumps(session.to_dict(ended_at), separators=(',', ':')) + "\n")
+
+    def _write_atomic(self, path, text):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    # Stream-Abonnement (Aufruf aus dem Lese-Thread)
+
+    def on_event(self, t, name):
+        if name in CLICK_TYPES:
+            with self.lock:
+                if self.session is not None:
+                    self.session.add_click(t, name)
+
+    def on_pressure(self, t, value):
+        with self.lock:
+            if self.session is not None:
+                self.session.add_pressure(t, value)
+
+    def on_joystick(self, t, x, y):
+        pass
+
+    # Abfragen
+
+    def query(self, days=90, granularity='day'):
+        """
+        Aggregierte Buckets der letzten `days` Tage inkl. laufender Sitzung.
+        granularity: 'day', 'week' (ISO-Woche) oder 'month'.
+        Gibt [(Label, Bucket)] chronologisch zurück.
+        """
+        first_day = (date.today() - timedelta(days=days - 1)).isoformat()
+        with self.lock:
+            merged = {day: dict(bucket) for day, bucket in self.daily.items() if day >= first_day}
+            if self.session is not None:
+                now = time.time()
+                for day, bucket in self.session.buckets.items():
+                    merge_bucket(merged.setdefault(day, empty_bucket()), bucket)
+                start_day = date.fromtimestamp(self.session.started_at).isoformat()
+                current = merged.setdefault(start_day, empty_bucket())
+                current['seconds'] += now - self.session.started_at
+                current['sessions'] += 1
+
+        grouped = {}
+        for day in sorted(merged):
+            label = self._period_label(date.fromisoformat(day), granularity)
+            merge_bucket(grouped.setdefault(label, empty_bucket()), merged[day])
+        return list(grouped.items())
+
+    @staticmethod
+    def _period_label(day, granularity):
+        if granularity == 'week':
+            year, week, _ = day.isocalendar()
+            return f"{year}-W{week:02d}"
+        if granularity == 'month':
+            return day.strftime("%Y-%m")
+        return day.isoformat()
+
+
+def clicks_per_hour(bucket, click):
+    hours = bucket['seconds'] / 3600
+    return bucket[click] / hours if hours > 0 else 0.0
+
+
+def misfire_rate(bucket):
+    clicks = sum(bucket[click] for click in CLICK_TYPES)
+    return bucket['misfires'] / clicks if clicks else 0.0
+
+
+def mean_pressure(bucket):
+    return bucket['pressure_sum'] / bucket['pressure_count'] if bucket['pressure_count'] else 0.0
+
+
+def mean_session_minutes(bucket):
+    return bucket['seconds'] / bucket['sessions'] / 60 if bucket['sessions'] else 0.0
+
+
+class AnalyticsWindow:
+    """Statistik-Fenster mit Tabs für die Trends"""
+
+    RANGES = {"Tage": ('day', 30), "Wochen": ('week', 182), "Monate": ('month', 365)}
+
+    def __init__(self, root, store):
+        self.store = store
+
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Nutzungsstatistik")
+        self.window.geometry("760x520")
+
+        self.range_selector = ctk.CTkSegmentedButton(self.window, values=list(self.RANGES),
+                                                     command=lambda _: self.refresh())
+        self.range_selector.set("Tage")
+        self.range_selector.pack(pady=(15, 5))
+
+        self.tabs = ctk.CTkTabview(self.window)
+        self.tabs.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        self.canvases = {}
+        for name in ("Klicks pro Stunde", "Fehlklicks", "Druck & Sitzungen"):
+            tab = self.tabs.add(name)
+            canvas = tk.Canvas(tab, bg="white", highlightthickness=0)
+            canvas.pack(fill="both", expand=True)
+            self.canvases[name] = canvas
+
+        self.window.after(100, self.refresh)
+
+    def refresh(self):
+        granularity, days = self.RANGES[self.range_selector.get()]
+        rows = self.store.query(days, granularity)
+        labels = [label for label, _ in rows]
+        buckets = [bucket for _, bucket in rows]
+
+        self.draw_bars(self.canvases["Klicks pro Stunde"], labels,
+                       {CLICK_NAMES[c]: ([clicks_per_hour(b, c) for b in buckets], CLICK_COLORS[c])
+                        for c in CLICK_TYPES}, "Klicks/h")
+        self.draw_bars(self.canvases["Fehlklicks"], labels,
+                       {"Verdacht": ([misfire_rate(b) * 100 for b in buckets], "#B20D30")}, "%")
+        self.draw_bars(self.canvases["Druck & Sitzungen"], labels,
+                       {"Ø Druck": ([mean_pressure(b) for b in buckets], "#B20D30"),
+                        "Ø Sitzung (min)": ([mean_session_minutes(b) for b in buckets], "#999999")}, "")
+
+    def draw_bars(self, canvas, labels, series, unit):
+        """Gruppierte Balken: series = {Name: (Werte, Farbe)}"""
+        canvas.delete("all")
+        canvas.update_idletasks()
+        width = canvas.winfo_width() or 700
+        height = canvas.winfo_height() or 380
+        if not labels:
+            canvas.create_text(width / 2, height / 2, text="Noch keine Daten", font=("Helvetica", 14))
+            return
+
+        peak = max([max(values) for values, _ in series.values()] + [1e-9])
+        left, bottom, top = 40, height - 40, 30
+        group_width = (width - left - 10) / len(labels)
+        bar_width = max(group_width / (len(series) + 1), 1)
+
+        canvas.create_text(left, 12, text=f"max {peak:.1f} {unit}", anchor="w", font=("Helvetica", 9))
+        for index, label in enumerate(labels):
+            x = left + index * group_width
+            for offset, (values, color) in enumerate(series.values()):
+                bar_height = values[index] / peak * (bottom - top)
+                x0 = x + offset * bar_width
+                canvas.create_rectangle(x0, bottom - bar_height, x0 + bar_width, bottom,
+                                        fill=color, outline="")
+            # Nur jede n-te Beschriftung, damit sie lesbar bleibt
+            if index % max(len(labels) // 10, 1) == 0:
+                canvas.create_text(x + group_width / 2, bottom + 12, text=label[-5:], font=("Helvetica", 8))
+
+        # Legende
+        legend_x = left
+        for name, (_, color) in series.items():
+            canvas.create_rectangle(legend_x, height - 14, legend_x + 10, height - 4, fill=color, outline="")
+            canvas.create_text(legend_x + 14, height - 9, text=name, anchor="w", font=("Helvetica", 9))
+            legend_x += 110
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def focus(self):
+        self.window.focus()
+
+
+if __name__ == "__main__":
+    store = AnalyticsStore(os.path.join(os.path.expanduser("~"), ".sippuff", "analytics"))
+    for label, bucket in store.query(365, 'month'):
+        print(f"{label}: " + ", ".join(f"{CLICK_NAMES[c]} {clicks_per_hour(bucket, c):.1f}/h" for c in CLICK_TYPES)
+              + f", Fehlklicks {misfire_rate(bucket) * 100:.1f}%, Ø Sitzung {mean_session_minutes(bucket):.0f} min")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Host-Kalibrierung
+Robuster Nullpunkt aus gestreamten Rohwerten (Median + MAD-Ausreißerfilter)
+
+Der Arduino sendet auf CALIBRATE:SAMPLES:<n> eine Zeile CAL:DATA:v1,v2,...
+(2 ms Abstand, 64 Samples ≈ 130 ms statt 1 s). Ein Atemzug während der
+Kalibrierung verschiebt den Median kaum und wird als Ausreißer verworfen.
+"""
+
+import random
+import statistics
+import sys
+
+CALIBRATION_SAMPLES = 64   # Samples pro Host-Kalibrierung
+OUTLIER_FACTOR = 3.0       # Ausreißer: Abweichung > 3 * robuste Standardabweichung
+MIN_INLIER_RATIO = 0.6     # Weniger gültige Samples -> Kalibrierung verwerfen
+
+
+class CalibrationResult:
+    """Ergebnis einer Host-Kalibrierung"""
+
+    def __init__(self, baseline, median, inliers, outliers, spread):
+        self.baseline = baseline
+        self.median = median
+        self.inliers = inliers
+        self.outliers = outliers
+        self.spread = spread
+
+    @property
+    def valid(self):
+        total = self.inliers + self.outliers
+        return total > 0 and self.inliers / total >= MIN_INLIER_RATIO
+
+
+def parse_samples(msg):
+    """Liest die Rohwerte aus einer CAL:DATA-Zeile"""
+    data = msg.split(":", 2)[2]
+    return [int(v) for v in data.split(",") if v]
+
+
+def robust_baseline(samples):
+    """Median, dann Mittelwert aller Samples innerhalb OUTLIER_FACTOR * MAD"""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(v - median) for v in samples)
+    # MAD -> Standardabweichung (Normalverteilung); ADC-Rauschen mind. 1 Count
+    spread = max(1.4826 * mad, 1.0)
+    limit = OUTLIER_FACTOR * spread
+
+    inliers = [v for v in samples if abs(v - median) <= limit]
+    baseline = round(sum(inliers) / len(inliers))
+    return CalibrationResult(baseline, median, len(inliers),
+                             len(samples) - len(inliers), spread)
+
+
+def mean_baseline(samples):
+    """Bisheriges Verfahren der Firmware (einfacher Mittelwert)"""
+    return sum(samples) // len(samples)
+
+
+class DriftTracker:
+    """Python-Nachbildung von trackBaselineDrift() aus main.cpp (für Simulationen)"""
+
+    QUIET_MS = 2000
+    STEP_MS = 500
+
+    def __init__(self, baseline, scroll_up=-5, scroll_down=5, debounce=500):
+        self.fixed = baseline * 256
+        self.quiet_since = 0
+        self.last_step = 0
+        self.scroll_up = scroll_up
+        self.scroll_down = scroll_down
+        self.debounce = debounce
+
+    @property
+    def baseline(self):
+        return (self.fixed + 128) // 256
+
+    def update(self, raw, t_ms, last_click_ms=0):
+        diff = raw - self.baseline
+        if diff > self.scroll_down or diff < self.scroll_up or t_ms - last_click_ms < self.debounce:
+            self.quiet_since = t_ms
+            return
+        if t_ms - self.quiet_since < self.QUIET_MS or t_ms - self.last_step < self.STEP_MS:
+            return
+        self.last_step = t_ms
+        self.fixed += int((raw * 256 - self.fixed) / 256)
+
+
+def simulate(seed=1, runs=30, minutes=20, click_left=10, click_right=-10):
+    """
+    Simuliert Kalibrierung mit Atemstörung und anschließende Erwärmungsdrift.
+    Gibt Fehlklicks pro Stunde für mean / robust / robust + Drift zurück.
+    """
+    rng = random.Random(seed)
+    loop_ms = 10
+    results = {'mean': 0, 'robust': 0, 'robust+drift': 0}
+
+    for _ in range(runs):
+        true_zero = rng.randint(500, 530)
+        noise = lambda: rng.gauss(0, 1.2)
+
+        # Kalibrierung: 50 (Firmware) bzw. 64 (Host) Samples, 20% davon Atemzug
+        def calibration_samples(count):
+            start = rng.randrange(count)
+            return [round(true_zero + noise() + (40 if start <= i < start + count // 5 else 0))
+                    for i in range(count)]
+
+        baselines = {
+            'mean': mean_baseline(calibration_samples(50)),
+            'robust': robust_baseline(calibration_samples(CALIBRATION_SAMPLES)).baseline,
+        }
+        baselines['robust+drift'] = baselines['robust']
+        tracker = DriftTracker(baselines['robust+drift'])
+        last_click = {key: 0 for key in results}   # lastClickTime startet in main.cpp bei 0
+
+        # Ruhige Nutzung: Sensor driftet beim Erwärmen um ~6 Counts
+        steps = minutes * 60 * 1000 // loop_ms
+        for step in range(steps):
+            t_ms = step * loop_ms
+            drift = 6 * (1 - 2.718 ** (-t_ms / 300000))
+            raw = round(true_zero + drift + noise())
+            tracker.update(raw, t_ms, last_click['robust+drift'])
+            baselines['robust+drift'] = tracker.baseline
+
+            for key, baseline in baselines.items():
+                diff = raw - baseline
+                if t_ms - last_click[key] >= 500 and (diff > click_left or diff < click_right):
+                    results[key] += 1
+                    last_click[key] = t_ms
+
+    hours = runs * minutes / 60
+    return {key: count / hours for key, count in results.items()}
+
+
+if __name__ == "__main__":
+    rates = simulate()
+    print("Fehlklicks pro Stunde (Simulation: Atemzug während Kalibrierung + Erwärmungsdrift)")
+    for key, rate in rates.items():
+        print(f"  {key:<14} {rate:8.1f}")
+    sys.exit(0)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Gerätediagnose
+Fragt die Firmware-Zähler (GET:STATS) zyklisch ab und zeigt Loop-Timing,
+Histogramm, ausgefallene Joystick-Updates und Serial-Rückstau über die Zeit
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+from collections import deque
+
+POLL_INTERVAL_MS = 1000   # Eine Abfrage pro Sekunde (eine Zeile, ~100 Bytes)
+HISTORY_LENGTH = 120      # Angezeigte Messfenster (2 Minuten)
+
+# Klassengrenzen des Firmware-Histogramms (HIST_EDGES_MS in main.cpp)
+HIST_LABELS = ["<5", "5-10", "10-12", "12-15", "15-20", "20-50", "50-100", "≥100"]
+
+# Felder, die jede STATS-Zeile enthalten muss (REJECTED fehlt bei älterer Firmware)
+REQUIRED_FIELDS = ('LOOPS', 'MIN', 'MEAN', 'MAX', 'HIST', 'TICKS', 'MISSED', 'RX', 'LINE')
+
+
+def parse_stats(msg):
+    """
+    Zerlegt STATS:LOOPS:..,MIN:..,... in ein Dict (Zeiten in µs).
+    ValueError bei abgeschnittener oder gestörter Zeile.
+    """
+    stats = {}
+    for field in msg[len("STATS:"):].split(","):
+        key, _, value = field.partition(":")
+        if key == 'HIST':
+            stats[key] = [int(v) for v in value.split("/")]
+        else:
+            stats[key] = int(value)
+    missing = [key for key in REQUIRED_FIELDS if key not in stats]
+    if missing or len(stats['HIST']) != len(HIST_LABELS):
+        raise ValueError(f"unvollständige STATS-Zeile ({', '.join(missing) or 'HIST'})")
+    return stats
+
+
+class DiagnosticsWindow:
+    """Diagnose-Fenster, pollt über request_stats() und erhält add_stats()"""
+
+    def __init__(self, root, request_stats):
+        self.request_stats = request_stats
+        self.history = deque(maxlen=HISTORY_LENGTH)
+        self.poll_job = None
+
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Gerätediagnose")
+        self.window.geometry("700x560")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        title = ctk.CTkLabel(self.window, text="Gerätediagnose", font=ctk.CTkFont(size=20, weight="bold"))
+        title.pack(pady=(15, 5))
+
+        self.summary_label = ctk.CTkLabel(self.window, text="Warte auf Daten...",
+                                          font=ctk.CTkFont(size=12), justify="left")
+        self.summary_label.pack(pady=(0, 10))
+
+        ctk.CTkLabel(self.window, text="Loop-Periode (ms): Mittel (rot) / Max (grau)",
+                     font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", padx=20)
+        self.chart = tk.Canvas(self.window, height=220, bg="white", highlightthickness=0)
+        self.chart.pack(fill="x", padx=20, pady=(0, 10))
+
+        ctk.CTkLabel(self.window, text="Histogramm (letzte Sekunde, ms)",
+                     font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", padx=20)
+        self.histogram = tk.Canvas(self.window, height=140, bg="white", highlightthickness=0)
+        self.histogram.pack(fill="x", padx=20, pady=(0, 15))
+
+        self.poll()
+
+    def poll(self):
+        self.request_stats()
+        self.poll_job = self.window.after(POLL_INTERVAL_MS, self.poll)
+
+    def add_stats(self, stats):
+        if not self.exists():
+            return
+        self.history.append(stats)
+        self.update_summary(stats)
+        self.draw_chart()
+        self.draw_histogram(stats['HIST'])
+
+    def update_summary(self, stats):
+        total_missed = sum(s['MISSED'] for s in self.history)
+        total_ticks = sum(s['TICKS'] for s in self.history)
+        self.summary_label.configure(
+            text=f"Loops: {stats['LOOPS']}   "
+                 f"Periode: min {stats['MIN'] / 1000:.1f} / Ø {stats['MEAN'] / 1000:.1f} / "
+                 f"max {stats['MAX'] / 1000:.1f} ms\n"
+                 f"Joystick-Updates: {stats['TICKS']} (ausgefallen: {stats['MISSED']}, "
+                 f"gesamt {total_missed}/{total_ticks + total_missed})   "
+                 f"RX-Puffer max: {stats['RX']} B   Längste Zeile: {stats['LINE']} B   "
+                 f"Zu lange Zeilen: {stats.get('REJECTED', 0)}")
+
+    def draw_chart(self):
+        canvas = self.chart
+        canvas.delete("all")
+        width = canvas.winfo_width() or 660
+        height = canvas.winfo_height() or 220
+        top = max(max(s['MAX'] for s in self.history) / 1000, 20)
+
+        # Gitterlinien
+        for value in (10, 20, 50, 100, 200):
+            if value <= top:
+                y = height - value / top * (height - 10)
+                canvas.create_line(0, y, width, y, fill="#EEEEEE")
+                canvas.create_text(4, y, text=str(value), anchor="sw", fill="gray", font=("Helvetica", 8))
+
+        step = width / (HISTORY_LENGTH - 1)
+        for key, color in (('MAX', "#999999"), ('MEAN', "#B20D30")):
+            points = []
+            for index, stats in enumerate(self.history):
+                points.extend((index * step, height - stats[key] / 1000 / top * (height - 10)))
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=color, width=2)
+
+    def draw_histogram(self, counts):
+        canvas = self.histogram
+        canvas.delete("all")
+        width = canvas.winfo_width() or 660
+        height = canvas.winfo_height() or 140
+        bar_width = width / len(counts)
+        peak = max(max(counts), 1)
+        for index, count in enumerate(counts):
+            x0 = index * bar_width + 4
+            bar_height = count / peak * (height - 35)
+            canvas.create_rectangle(x0, height - 20 - bar_height, x0 + bar_width - 8, height - 20,
+                                    fill="#B20D30", outline="")
+            canvas.create_text(x0 + bar_width / 2 - 4, height - 10, text=HIST_LABELS[index],
+                               font=("Helvetica", 9))
+            canvas.create_text(x0 + bar_width / 2 - 4, height - 25 - bar_height, text=str(count),
+                               font=("Helvetica", 9))
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def focus(self):
+        self.window.focus()
+
+    def close(self):
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.window.destroy()
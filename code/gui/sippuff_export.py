@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Daten-Export
+Schreibt Druck-, Joystick- und Event-Streams gebündelt in CSV- und Spaltendateien
+
+Der Lese-Thread der GUI hängt Datensätze nur an einen Puffer an. Ein eigener
+Writer-Thread leert den Puffer in festen Intervallen und schreibt die Batches.
+Ist der Puffer voll, werden neue Datensätze verworfen (und gezählt), damit der
+Lesepfad nie blockiert.
+"""
+
+import csv
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime
+
+# Streams: Name -> Spalten (Zeitstempel ist immer die erste Spalte)
+STREAMS = {
+    'pressure': ('t', 'value'),
+    'joystick': ('t', 'x', 'y'),
+    'events': ('t', 'event'),
+}
+
+# Spaltentypen für das Spaltenformat ('d' = double, 'i' = int32, 's' = Text)
+COLUMN_TYPES = {
+    'pressure': ('d', 'i'),
+    'joystick': ('d', 'i', 'i'),
+    'events': ('d', 's'),
+}
+
+COLUMNAR_MAGIC = b"SPCOL1\n"
+COLUMNAR_EXTENSION = ".spcol"
+
+
+class _RotatingWriter:
+    """Basisklasse: Datei pro Stream mit Rotation nach Größe oder Zeit"""
+
+    extension = ""
+
+    def __init__(self, directory, stream, rotate_bytes, rotate_seconds):
+        self.directory = directory
+        self.stream = stream
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.file = None
+        self.file_index = 0
+        self.opened_at = 0.0
+        self.bytes_written = 0
+
+    def _open(self):
+        self.file_index += 1
+        name = f"{self.stream}_{self.file_index:03d}{self.extension}"
+        self.file = open(os.path.join(self.directory, name), 'wb')
+        self.opened_at = time.monotonic()
+        self.bytes_written = 0
+        self._write_header()
+
+    def _needs_rotation(self):
+        if self.rotate_bytes and self.bytes_written >= self.rotate_bytes:
+            return True
+        if self.rotate_seconds and time.monotonic() - self.opened_at >= self.rotate_seconds:
+            return True
+        return False
+
+    def write_batch(self, rows):
+        if self.file is None:
+            self._open()
+        elif self._needs_rotation():
+            self.close()
+            self._open()
+        data = self._encode(rows)
+        self.file.write(data)
+        self.bytes_written += len(data)
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write_header(self):
+        pass
+
+    def _encode(self, rows):
+        raise NotImplementedError
+
+
+class CSVWriter(_RotatingWriter):
+    """CSV mit Kopfzeile, eine Zeile pro Datensatz"""
+
+    extension = ".csv"
+
+    def _write_header(self):
+        header = (",".join(STREAMS[self.stream]) + "\n").encode('utf-8')
+        self.file.write(header)
+        self.bytes_written += len(header)
+
+    def _encode(self, rows):
+        if self.stream == 'events':
+            lines = [f"{t:.6f},{_csv_text(name)}\n" for t, name in rows]
+        else:
+            lines = [f"{row[0]:.6f}," + ",".join(str(v) for v in row[1:]) + "\n" for row in rows]
+        return "".join(lines).encode('utf-8')
+
+
+class ColumnarWriter(_RotatingWriter):
+    """
+    Kompaktes Spaltenformat: Header (Magic + JSON-Schema), danach Blöcke.
+    Jeder Block: Zeilenanzahl (uint32), dann jede Spalte zusammenhängend.
+    Zahlen als little-endian Arrays, Text als Länge (uint32) + UTF-8 mit \\n getrennt.
+    """
+
+    extension = COLUMNAR_EXTENSION
+
+    def _write_header(self):
+        schema = json.dumps({'stream': self.stream,
+                             'columns': STREAMS[self.stream],
+                             'types': COLUMN_TYPES[self.stream]}).encode('utf-8')
+        header = COLUMNAR_MAGIC + struct.pack('<I', len(schema)) + schema
+        self.file.write(header)
+        self.bytes_written += len(header)
+
+    def _encode(self, rows):
+        parts = [struct.pack('<I', len(rows))]
+        for index, type_code in enumerate(COLUMN_TYPES[self.stream]):
+            column = [row[index] for row in rows]
+            if type_code == 's':
+                text = "\n".join(column).encode('utf-8')
+                parts.append(struct.pack('<I', len(text)))
+                parts.append(text)
+            else:
+                parts.append(_little_endian(array(type_code, column)))
+        return b"".join(parts)
+
+
+def _csv_text(value):
+    """Maskiert Text für CSV nur wenn nötig (Events sind meist reine Namen)"""
+    if ',' in value or '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _little_endian(values):
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_columnar(path):
+    """Liest eine Spaltendatei komplett ein und gibt {Spalte: Liste} zurück"""
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"Keine Spaltendatei: {path}")
+        schema_len, = struct.unpack('<I', f.read(4))
+        schema = json.loads(f.read(schema_len).decode('utf-8'))
+        columns = {name: [] for name in schema['columns']}
+
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                break
+            rows, = struct.unpack('<I', head)
+            for name, type_code in zip(schema['columns'], schema['types']):
+                if type_code == 's':
+                    text_len, = struct.unpack('<I', f.read(4))
+                    text = f.read(text_len).decode('utf-8')
+                    columns[name].extend(text.split("\n") if rows else [])
+                else:
+                    size = struct.calcsize('<' + type_code)
+                    columns[name].extend(struct.unpack(f'<{rows}{type_code}', f.read(rows * size)))
+    return columns
+
+
+def read_csv(path):
+    """Liest eine exportierte CSV-Datei als Liste von Dicts"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+class DataExporter:
+    """
+    Abonniert den Live-Stream der GUI und schreibt ihn im Hintergrund.
+
+    submit_* wird aus dem Lese-Thread aufgerufen und hängt nur an eine Liste an.
+    Der Writer-Thread tauscht die Listen alle flush_interval Sekunden aus und
+    schreibt den Batch in alle aktiven Formate. Schlägt das Schreiben fehl
+    (z.B. Platte voll), endet der Export: running wird False, der Fehler steht
+    in error und on_error(Fehler) wird aus dem Writer-Thread aufgerufen.
+    """
+
+    def __init__(self, base_dir, formats=('csv', 'columnar'),
+                 rotate_bytes=50 * 1024 * 1024, rotate_seconds=3600,
+                 max_pending=20000, flush_interval=0.5, on_error=None):
+        self.base_dir = base_dir
+        self.formats = tuple(formats)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+
+        self.session_dir = None
+        self.running = False
+        self.error = None
+        self.dropped = 0
+        self.written = 0
+
+        self._lock = threading.Lock()
+        self._pending = {stream: [] for stream in STREAMS}
+        self._pending_count = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._writers = {}
+
+    def start(self):
+        """Startet eine neue Export-Sitzung in einem eigenen Unterordner"""
+        if self.running:
+            return self.session_dir
+        self.stop()   # Thread eines abgebrochenen Exports aufräumen
+
+        session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.session_dir = os.path.join(self.base_dir, session)
+        os.makedirs(self.session_dir, exist_ok=True)
+
+        writer_classes = {'csv': CSVWriter, 'columnar': ColumnarWriter}
+        self._writers = {
+            stream: [writer_classes[fmt](self.session_dir, stream,
+                                         self.rotate_bytes, self.rotate_seconds)
+                     for fmt in self.formats]
+            for stream in STREAMS
+        }
+
+        self.error = None
+        self.dropped = 0
+        self.written = 0
+        self._pending = {stream: [] for stream in STREAMS}
+        self._pending_count = 0
+        self._stop_event.clear()
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.session_dir
+
+    def stop(self):
+        """Stoppt den Writer-Thread, schreibt verbleibende Daten, gibt den Schreibfehler zurück (oder None)"""
+        self.running = False
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        return self.error
+
+    # Stream-Abonnement (Aufruf aus dem Lese-Thread)
+
+    def on_pressure(self, t, value):
+        self._submit('pressure', (t, value))
+
+    def on_joystick(self, t, x, y):
+        self._submit('joystick', (t, x, y))
+
+    def on_event(self, t, name):
+        self._submit('events', (t, name))
+
+    def _submit(self, stream, row):
+        if not self.running:
+            return
+        with self._lock:
+            if self._pending_count >= self.max_pending:
+                # Backpressure: Daten verwerfen statt Latenz aufzubauen
+                self.dropped += 1
+                return
+            self._pending[stream].append(row)
+            self._pending_count += 1
+
+    # Writer-Thread
+
+    def _run(self):
+        try:
+            while not self._stop_event.wait(self.flush_interval):
+                self._flush_pending()
+            self._flush_pending()
+        except Exception as e:
+            self.error = e
+            self.running = False
+        finally:
+            for writers in self._writers.values():
+                for writer in writers:
+                    try:
+                        writer.close()
+                    except OSError as e:
+                        self.error = self.error or e
+        if self.error is not None and self.on_error is not None:
+            self.on_error(self.error)
+
+    def _flush_pending(self):
+        with self._lock:
+            batches = self._pending
+            self._pending = {stream: [] for stream in STREAMS}
+            self._pending_count = 0
+
+        for stream, rows in batches.items():
+            if not rows:
+                continue
+            for writer in self._writers[stream]:
+                writer.write_batch(rows)
+                writer.flush()
+            self.written += len(rows)
+
+
+def benchmark(samples=200000):
+    """Misst die Kosten von on_pressure() auf dem Lesepfad (ns pro Aufruf)"""
+    import tempfile
+
+    def measure(target):
+        start = time.perf_counter()
+        for i in range(samples):
+            target(i * 0.001, i % 400)
+        return (time.perf_counter() - start) / samples * 1e9
+
+    baseline = measure(lambda t, v: None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = DataExporter(tmp, max_pending=samples)
+        exporter.start()
+        exporting = measure(exporter.on_pressure)
+        write_start = time.perf_counter()
+        exporter.stop()
+        drain = time.perf_counter() - write_start
+
+    return {
+        'samples': samples,
+        'baseline_ns': baseline,
+        'export_ns': exporting,
+        'overhead_ns': exporting - baseline,
+        'drain_s': drain,
+        'written': exporter.written,
+        'dropped': exporter.dropped,
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"Samples:         {result['samples']}")
+    print(f"Ohne Export:     {result['baseline_ns']:.0f} ns/Sample")
+    print(f"Mit Export:      {result['export_ns']:.0f} ns/Sample")
+    print(f"Overhead:        {result['overhead_ns']:.0f} ns/Sample")
+    print(f"Restlicher Flush:{result['drain_s'] * 1000:.1f} ms")
+    print(f"Geschrieben: {result['written']}, verworfen: {result['dropped']}")
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Zeigetest (Fitts' Law)
+Standardisierte Zielauswahl-Aufgabe (ISO 9241-9, multidirektional) zum
+objektiven Vergleich von Einstellungs-Profilen
+
+Pro Profil werden Sequenzen mit verschiedenen Abständen (A) und Zielgrößen (W)
+gefahren. Jede Auswahl wird sofort in eine CSV geschrieben, am Ende wird der
+effektive Durchsatz (bits/s) pro Profil mit Konfidenzintervall berechnet.
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+import csv
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+from sippuff_schema import BY_KEY, PROFILE_SETTINGS
+
+# Aufgaben-Parameter
+TARGET_COUNT = 9                          # Ziele im Kreis (ungerade)
+CONDITIONS = [(250, 30), (250, 60), (500, 30), (500, 60)]  # (Abstand A, Breite W) in px
+ROUNDS = 2                                # Profile werden ABAB... abgewechselt
+DOUBLE_CLICK_GUARD = 0.12                 # Zweiter Klick eines Doppelklicks wird ignoriert (s)
+
+# Standard-Kandidaten (landen in ~/.sippuff/fitts_profiles.json)
+DEFAULT_CANDIDATES = [
+    {'name': 'A', 'wavelength': 15, 'period': 35, 'deadzone': 25},
+    {'name': 'B', 'wavelength': 25, 'period': 25, 'deadzone': 25},
+]
+
+TRIAL_FIELDS = ['timestamp', 'profile', 'round', 'amplitude', 'width', 'sequence',
+                'trial', 'mt_ms', 'dx', 'ae', 'hit', 'click_x', 'click_y']
+
+# Zweiseitige t-Werte für 95%-Konfidenzintervalle (Freiheitsgrade 1-30)
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def target_order(count=TARGET_COUNT):
+    """Reihenfolge der Ziele: immer zum (fast) gegenüberliegenden Ziel"""
+    step = count // 2 + 1
+    return [(i * step) % count for i in range(count)]
+
+
+def projected_deviation(start, target, click):
+    """Abweichung des Klicks vom Ziel entlang der Bewegungsachse (px)"""
+    a = math.dist(start, target)
+    b = math.dist(click, target)
+    c = math.dist(start, click)
+    if a == 0:
+        return 0.0
+    return (c * c - b * b - a * a) / (2 * a)
+
+
+def sequence_throughput(trials):
+    """Effektiver Durchsatz (bits/s) einer Sequenz nach ISO 9241-9"""
+    if len(trials) < 2:
+        return None
+    dxs = [t['dx'] for t in trials]
+    mean_dx = sum(dxs) / len(dxs)
+    sd = math.sqrt(sum((d - mean_dx) ** 2 for d in dxs) / (len(dxs) - 1))
+    we = 4.133 * sd
+    ae = sum(t['ae'] for t in trials) / len(trials)
+    mt = sum(t['mt_ms'] for t in trials) / len(trials) / 1000.0
+    if we <= 0 or mt <= 0:
+        return None
+    ide = math.log2(ae / we + 1)
+    return ide / mt
+
+
+def mean_ci(values):
+    """Mittelwert und halbe Breite des 95%-Konfidenzintervalls"""
+    n = len(values)
+    if n == 0:
+        return None, None
+    mean = sum(values) / n
+    if n == 1:
+        return mean, None
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    t = T_95[n - 2] if n - 1 <= len(T_95) else 1.96
+    return mean, t * sd / math.sqrt(n)
+
+
+def summarize(trials):
+    """Fasst Trials pro Profil zusammen (Durchsatz, Bewegungszeit, Fehlerrate)"""
+    sequences = {}
+    for trial in trials:
+        key = (trial['profile'], trial['round'], trial['sequence'])
+        sequences.setdefault(key, []).append(trial)
+
+    profiles = {}
+    for (profile, _, _), seq_trials in sequences.items():
+        entry = profiles.setdefault(profile, {'throughputs': [], 'mt': [], 'hits': 0, 'trials': 0})
+        tp = sequence_throughput(seq_trials)
+        if tp is not None:
+            entry['throughputs'].append(tp)
+        entry['mt'].extend(t['mt_ms'] for t in seq_trials)
+        entry['hits'] += sum(1 for t in seq_trials if t['hit'])
+        entry['trials'] += len(seq_trials)
+
+    summary = {}
+    for profile, entry in profiles.items():
+        tp_mean, tp_ci = mean_ci(entry['throughputs'])
+        mt_mean, mt_ci = mean_ci(entry['mt'])
+        summary[profile] = {
+            'throughput': tp_mean,
+            'throughput_ci95': tp_ci,
+            'movement_time_ms': mt_mean,
+            'movement_time_ci95': mt_ci,
+            'error_rate': 1 - entry['hits'] / entry['trials'] if entry['trials'] else None,
+            'sequences': len(entry['throughputs']),
+            'trials': entry['trials'],
+        }
+    return summary
+
+
+def load_trials(path):
+    """Liest eine Trial-CSV (auch von abgebrochenen Sitzungen)"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        trials = []
+        for row in csv.DictReader(f):
+            row['round'] = int(row['round'])
+            row['sequence'] = int(row['sequence'])
+            for key in ('mt_ms', 'dx', 'ae'):
+                row[key] = float(row[key])
+            row['hit'] = row['hit'] == '1'
+            trials.append(row)
+        return trials
+
+
+def format_summary(summary):
+    lines = []
+    for profile, s in summary.items():
+        ci = f" ± {s['throughput_ci95']:.2f}" if s['throughput_ci95'] is not None else ""
+        tp = f"{s['throughput']:.2f}" if s['throughput'] is not None else "–"
+        lines.append(f"{profile}: {tp}{ci} bits/s | MT {s['movement_time_ms']:.0f} ms | "
+                     f"Fehler {s['error_rate'] * 100:.1f}% | {s['sequences']} Sequenzen")
+    return "\n".join(lines)
+
+
+def validate_candidate(candidate):
+    """Prüft ein Kandidaten-Profil gegen das Schema, ValueError bei unbekanntem Schlüssel/Wert"""
+    if 'name' not in candidate:
+        raise ValueError(f"Profil ohne Namen: {candidate}")
+    validated = {'name': str(candidate['name'])}
+    for key, value in candidate.items():
+        if key == 'name':
+            continue
+        setting = BY_KEY.get(key)
+        if setting is None or not setting.profile:
+            raise ValueError(f"Profil {validated['name']}: unbekannte Einstellung '{key}'")
+        try:
+            validated[key] = setting.validate(value)
+        except ValueError as e:
+            raise ValueError(f"Profil {validated['name']}: {e}")
+    return validated
+
+
+def load_candidates(path):
+    """Lädt und prüft die Kandidaten-Profile oder erstellt die Datei mit Standard-Werten"""
+    if not os.path.exists(path):
+        with open(path, 'w') as f:
+            json.dump(DEFAULT_CANDIDATES, f, indent=2)
+        return list(DEFAULT_CANDIDATES)
+    with open(path, 'r') as f:
+        return [validate_candidate(candidate) for candidate in json.load(f)]
+
+
+class FittsTestWindow:
+    """
+    Zeigetest-Fenster. Schaltet vor jedem Block das nächste Kandidaten-Profil
+    über send_value(key, value) auf den Arduino und stellt am Ende
+    restore() die ursprünglichen Einstellungen wieder her.
+
+    Jeder Kandidat wird auf dieselbe Basis (Einstellungen beim Start) gelegt
+    und vollständig gesendet, damit keine Werte des vorigen Profils bleiben.
+    """
+
+    def __init__(self, root, candidates, base, results_dir, send_value, restore, log):
+        self.candidates = candidates
+        self.base = {s.key: base[s.key] for s in PROFILE_SETTINGS}
+        self.send_value = send_value
+        self.restore = restore
+        self.log = log
+
+        os.makedirs(results_dir, exist_ok=True)
+        session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.results_path = os.path.join(results_dir, f"fitts_{session}.csv")
+        self.summary_path = os.path.join(results_dir, f"fitts_{session}_summary.json")
+        self.results_file = open(self.results_path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.results_file, fieldnames=TRIAL_FIELDS)
+        self.writer.writeheader()
+
+        # Blöcke: (Runde, Profil) ABAB..., je Block alle Bedingungen
+        self.blocks = [(r, c) for r in range(ROUNDS) for c in candidates]
+        self.block_index = -1
+        self.condition_index = 0
+        self.sequence_number = 0
+        self.trials = []
+        self.waiting_for_start = True
+
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Zeigetest (Fitts' Law)")
+        self.window.geometry("1100x800")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.info_label = ctk.CTkLabel(self.window, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.info_label.pack(pady=(10, 5))
+
+        self.canvas = tk.Canvas(self.window, bg="white", highlightthickness=0, cursor="crosshair")
+        self.canvas.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.canvas.bind("<Button-1>", self.on_click)
+
+        self.window.after(100, self.next_block)
+
+    # Ablauf
+
+    def next_block(self):
+        self.block_index += 1
+        if self.block_index >= len(self.blocks):
+            self.finish()
+            return
+
+        round_number, candidate = self.blocks[self.block_index]
+        profile = dict(self.base)
+        profile.update((key, value) for key, value in candidate.items() if key != 'name')
+        for key, value in profile.items():
+            self.send_value(key, value)
+        self.condition_index = 0
+        self.show_pause(f"Profil {candidate['name']} (Runde {round_number + 1}/{ROUNDS}) geladen.\n"
+                        f"Klicken zum Starten")
+
+    def show_pause(self, text):
+        self.waiting_for_start = True
+        self.canvas.delete("all")
+        self.canvas.create_text(self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2,
+                                text=text, font=("Helvetica", 20), justify="center")
+        self.info_label.configure(text="")
+
+    def start_sequence(self):
+        self.waiting_for_start = False
+        self.sequence_number += 1
+        self.amplitude, self.width = CONDITIONS[self.condition_index]
+        self.order = target_order()
+        self.position = 0
+        self.last_click_time = None
+        self.last_point = None
+        self.draw_targets()
+
+    def target_center(self, index):
+        cx = self.canvas.winfo_width() / 2
+        cy = self.canvas.winfo_height() / 2
+        angle = 2 * math.pi * index / TARGET_COUNT
+        radius = self.amplitude / 2
+        return (cx + radius * math.sin(angle), cy - radius * math.cos(angle))
+
+    def draw_targets(self):
+        self.canvas.delete("all")
+        current = self.order[self.position]
+        r = self.width / 2
+        for index in range(TARGET_COUNT):
+            x, y = self.target_center(index)
+            color = "#B20D30" if index == current else "#DDDDDD"
+            self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=color, outline="")
+
+        round_number, candidate = self.blocks[self.block_index]
+        self.info_label.configure(
+            text=f"Profil {candidate['name']} | A={self.amplitude} W={self.width} | "
+                 f"Ziel {self.position + 1}/{TARGET_COUNT}")
+
+    def on_click(self, event):
+        now = time.perf_counter()
+
+        if self.waiting_for_start:
+            self.start_sequence()
+            return
+
+        # Zweiter Klick eines Doppelklicks (starkes Pusten)
+        if self.last_click_time is not None and now - self.last_click_time < DOUBLE_CLICK_GUARD:
+            return
+
+        target = self.target_center(self.order[self.position])
+        click = (event.x, event.y)
+        hit = math.dist(click, target) <= self.width / 2
+
+        # Der erste Klick startet nur die Zeitmessung
+        if self.last_click_time is not None:
+            start = self.target_center(self.order[self.position - 1])
+            dx = projected_deviation(start, target, click)
+            self.record_trial(now - self.last_click_time, dx, math.dist(start, target) + dx, hit, click)
+
+        self.last_click_time = now
+        self.position += 1
+        if self.position < TARGET_COUNT:
+            self.draw_targets()
+            return
+
+        self.condition_index += 1
+        if self.condition_index < len(CONDITIONS):
+            self.show_pause("Sequenz fertig.\nKlicken für die nächste")
+        else:
+            self.next_block()
+
+    def record_trial(self, mt, dx, ae, hit, click):
+        round_number, candidate = self.blocks[self.block_index]
+        trial = {
+            'timestamp': f"{time.time():.3f}",
+            'profile': candidate['name'],
+            'round': round_number,
+            'amplitude': self.amplitude,
+            'width': self.width,
+            'sequence': self.sequence_number,
+            'trial': self.position,
+            'mt_ms': mt * 1000,
+            'dx': dx,
+            'ae': ae,
+            'hit': hit,
+            'click_x': click[0],
+            'click_y': click[1],
+        }
+        self.trials.append(trial)
+
+        # Sofort schreiben, damit abgebrochene Sitzungen erhalten bleiben
+        self.writer.writerow(dict(trial, hit=1 if hit else 0,
+                                  mt_ms=f"{trial['mt_ms']:.1f}",
+                                  dx=f"{dx:.2f}", ae=f"{ae:.2f}"))
+        self.results_file.flush()
+
+    def finish(self):
+        summary = summarize(self.trials)
+        with open(self.summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        text = format_summary(summary)
+        self.canvas.delete("all")
+        self.canvas.create_text(self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2,
+                                text="Ergebnis (Durchsatz, 95%-KI)\n\n" + text,
+                                font=("Helvetica", 16), justify="center")
+        self.info_label.configure(text="Test abgeschlossen")
+        self.log(f"Zeigetest abgeschlossen: {self.results_path}")
+        for line in text.splitlines():
+            self.log(f"  {line}")
+        self.close_results()
+        self.restore()
+
+    def close_results(self):
+        if not self.results_file.closed:
+            self.results_file.close()
+
+    def close(self):
+        if self.block_index < len(self.blocks):
+            self.log(f"Zeigetest abgebrochen ({len(self.trials)} Trials gespeichert)")
+            self.restore()
+        self.close_results()
+        self.window.destroy()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def focus(self):
+        self.window.focus()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Verwendung: python sippuff_fitts.py fitts_<Sitzung>.csv")
+        sys.exit(2)
+    print(format_summary(summarize(load_trials(sys.argv[1]))))
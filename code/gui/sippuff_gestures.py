@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Gesten-Erkennung
+Erkennt zeitlich begrenzte Sip/Puff-Folgen (z.B. Puff-Puff, Sip-Hold) und
+löst dafür Tastenkürzel oder Makros aus
+
+Die Gesten-Tabelle wird einmalig in einen Präfixbaum übersetzt. Jedes Token
+rückt den Automaten um genau einen Knoten vor, die Erkennung ist also
+inkrementell. Eine Geste feuert sofort, wenn keine längere Geste mit ihr
+beginnt, sonst spätestens nach ihrer max_gap_ms (Latenz-Budget).
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+
+# Tokens
+PUFF = 'puff'
+PUFF_STRONG = 'puff_strong'
+SIP = 'sip'
+PUFF_HOLD = 'puff_hold'
+SIP_HOLD = 'sip_hold'
+
+TOKENS = (PUFF, PUFF_STRONG, SIP, PUFF_HOLD, SIP_HOLD)
+
+# ACTION-Meldungen der Firmware -> Tokens
+ACTION_TOKENS = {
+    'LEFT_CLICK': PUFF,
+    'DOUBLE_CLICK': PUFF_STRONG,
+    'RIGHT_CLICK': SIP,
+}
+
+DEFAULT_MAX_GAP_MS = 800
+DEFAULT_BUDGET_MS = 2000
+DEFAULT_HOLD_MS = 600
+
+# Standard-Gestentabelle (landet in sippuff_defaults.json)
+# Die Firmware klickt bei jedem Token selbst mit. Kein Standard endet daher
+# auf Sip (Rechtsklick -> Kontextmenü würde die Tasten abfangen); Sip-Gesten
+# nur als *_hold, die es nur mit Quelle "samples" gibt.
+DEFAULT_GESTURES = [
+    {'name': 'Kopieren', 'sequence': [PUFF, PUFF], 'keys': 'ctrl+c'},
+    {'name': 'Einfügen', 'sequence': [PUFF_STRONG, PUFF], 'keys': 'ctrl+v'},
+    {'name': 'Rückgängig', 'sequence': [PUFF_STRONG, PUFF_STRONG], 'keys': 'ctrl+z'},
+    {'name': 'Escape', 'sequence': [SIP_HOLD], 'keys': 'esc'},
+]
+
+
+class Gesture:
+    """Eine Geste aus der Profil-Tabelle"""
+
+    def __init__(self, name, sequence, max_gap_ms=DEFAULT_MAX_GAP_MS,
+                 budget_ms=DEFAULT_BUDGET_MS, keys=None, macro=None):
+        if not sequence:
+            raise ValueError(f"Geste '{name}' hat keine Sequenz")
+        for token in sequence:
+            if token not in TOKENS:
+                raise ValueError(f"Geste '{name}': unbekanntes Token '{token}'")
+        self.name = name
+        self.sequence = tuple(sequence)
+        self.max_gap = max_gap_ms / 1000.0
+        self.budget = budget_ms / 1000.0
+        self.keys = keys
+        self.macro = macro
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry['name'], entry['sequence'],
+                   max_gap_ms=entry.get('max_gap_ms', DEFAULT_MAX_GAP_MS),
+                   budget_ms=entry.get('budget_ms', DEFAULT_BUDGET_MS),
+                   keys=entry.get('keys'),
+                   macro=entry.get('macro'))
+
+
+class _Node:
+    __slots__ = ('children', 'gesture', 'max_gap', 'budget')
+
+    def __init__(self):
+        self.children = {}
+        self.gesture = None
+        self.max_gap = 0.0  # Längste Wartezeit aller Gesten durch diesen Knoten
+        self.budget = 0.0   # Größtes Zeitbudget aller Gesten durch diesen Knoten
+
+
+def compile_gestures(gestures):
+    """Übersetzt die Gesten in einen Präfixbaum (Wurzelknoten)"""
+    root = _Node()
+    for gesture in gestures:
+        node = root
+        for token in gesture.sequence:
+            node = node.children.setdefault(token, _Node())
+            node.max_gap = max(node.max_gap, gesture.max_gap)
+            node.budget = max(node.budget, gesture.budget)
+        if node.gesture is not None:
+            raise ValueError(f"Gesten '{node.gesture.name}' und '{gesture.name}' "
+                             f"haben dieselbe Sequenz")
+        node.gesture = gesture
+    return root
+
+
+class GestureEngine:
+    """
+    Inkrementeller Automat über dem Token-Stream.
+
+    feed(token, t) rückt den Automaten vor, tick(t) löst wartende Gesten
+    nach Ablauf ihrer Lücke aus. Erkannte Gesten gehen an on_gesture(gesture,
+    t_fire, latency), wobei latency die Zeit seit dem letzten Token ist.
+    """
+
+    def __init__(self, gestures, on_gesture=None):
+        self.gestures = list(gestures)
+        self.root = compile_gestures(self.gestures)
+        self.on_gesture = on_gesture
+        self.reset()
+
+    def reset(self):
+        self.node = self.root
+        self.started_at = 0.0
+        self.last_token_at = 0.0
+
+    def feed(self, token, t):
+        # Token passt nicht mehr zum laufenden Präfix: wartende Geste auslösen
+        if self.node is not self.root and token not in self.node.children:
+            self._fire_pending(t)
+
+        if self.node is self.root:
+            if token not in self.root.children:
+                return
+            self.started_at = t
+
+        self.node = self.node.children[token]
+        self.last_token_at = t
+
+        # Keine längere Geste möglich: sofort auslösen
+        if not self.node.children:
+            self._fire_pending(t)
+        elif t - self.started_at > self.node.budget:
+            # Keine Geste kann ihr Zeitbudget noch einhalten
+            self.reset()
+
+    def tick(self, t):
+        """Prüft, ob die Lücke nach dem letzten Token abgelaufen ist"""
+        if self.node is not self.root and t - self.last_token_at >= self.node.max_gap:
+            self._fire_pending(t)
+
+    def next_deadline(self):
+        """Zeitpunkt, zu dem tick() spätestens aufgerufen werden sollte (oder None)"""
+        if self.node is self.root:
+            return None
+        return self.last_token_at + self.node.max_gap
+
+    def _fire_pending(self, t):
+        gesture = self.node.gesture
+        last_token_at = self.last_token_at
+        duration = last_token_at - self.started_at
+        self.reset()
+        if gesture is not None and duration <= gesture.budget and self.on_gesture:
+            self.on_gesture(gesture, t, t - last_token_at)
+
+
+class PressureTokenizer:
+    """
+    Erzeugt Tokens aus dem Druck-Stream: kurzer Puff/Sip beim Loslassen,
+    *_hold sobald der Druck hold_ms lang über der Schwelle liegt.
+    """
+
+    def __init__(self, puff_threshold, sip_threshold, hold_ms=DEFAULT_HOLD_MS):
+        self.puff_threshold = puff_threshold
+        self.sip_threshold = sip_threshold
+        self.hold = hold_ms / 1000.0
+        self.state = None  # None, PUFF oder SIP
+        self.started_at = 0.0
+        self.hold_sent = False
+
+    def feed(self, value, t):
+        """Gibt ein Token oder None zurück"""
+        if value > self.puff_threshold:
+            current = PUFF
+        elif value < self.sip_threshold:
+            current = SIP
+        else:
+            current = None
+
+        token = None
+        if current != self.state:
+            if self.state is not None and not self.hold_sent:
+                token = self.state
+            self.state = current
+            self.started_at = t
+            self.hold_sent = False
+        elif current is not None and not self.hold_sent and t - self.started_at >= self.hold:
+            self.hold_sent = True
+            token = PUFF_HOLD if current == PUFF else SIP_HOLD
+        return token
+
+
+class GestureRecognizer:
+    """
+    Stream-Abonnent der GUI: übersetzt ACTION-Events oder Druck-Samples in
+    Tokens und speist damit die GestureEngine.
+
+    on_event/on_pressure kommen aus dem Lese-Thread, tick() aus dem GUI-Thread;
+    ein Lock hält den Automaten konsistent. on_gesture wird unter dem Lock
+    aufgerufen und darf den Recognizer daher nicht selbst wieder aufrufen.
+    """
+
+    def __init__(self, profile, on_gesture=None):
+        gestures = [Gesture.from_dict(entry) for entry in profile.get('gestures', [])]
+        self.source = profile.get('gesture_source', 'events')
+        self.engine = GestureEngine(gestures, on_gesture)
+        self.tokenizer = PressureTokenizer(profile.get('click_left', 10),
+                                           profile.get('click_right', -10),
+                                           profile.get('gesture_hold_ms', DEFAULT_HOLD_MS))
+        self.last_sample_t = 0.0
+        self._lock = threading.Lock()
+
+    def on_event(self, t, name):
+        if self.source == 'events' and name in ACTION_TOKENS:
+            with self._lock:
+                self.engine.tick(t)
+                self.engine.feed(ACTION_TOKENS[name], t)
+
+    def on_pressure(self, t, value):
+        if self.source == 'samples':
+            with self._lock:
+                # Nachgelieferte Samples (Monitor-Burst) sind älter als der Stream -> überspringen
+                if t < self.last_sample_t:
+                    return
+                self.last_sample_t = t
+                self.engine.tick(t)
+                token = self.tokenizer.feed(value, t)
+                if token is not None:
+                    self.engine.feed(token, t)
+
+    def on_joystick(self, t, x, y):
+        pass
+
+    def tick(self, t):
+        with self._lock:
+            self.engine.tick(t)
+
+
+class KeyboardOutput:
+    """Führt Tastenkürzel und Makros aus (benötigt pynput)"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.worker = None
+        try:
+            from pynput.keyboard import Controller, Key
+        except ImportError:
+            self.controller = None
+            return
+        self.controller = Controller()
+        self.special_keys = {name: getattr(Key, name) for name in dir(Key)
+                             if not name.startswith('_')}
+        self.special_keys.update({'ctrl': Key.ctrl, 'strg': Key.ctrl,
+                                  'alt': Key.alt, 'shift': Key.shift,
+                                  'cmd': Key.cmd, 'win': Key.cmd,
+                                  'escape': Key.esc, 'return': Key.enter})
+
+    @property
+    def available(self):
+        return self.controller is not None
+
+    def submit(self, gesture, on_error=None):
+        """
+        Reiht eine Geste zur Ausführung ein. Ein einzelner Hintergrund-Thread
+        arbeitet die Warteschlange der Reihe nach ab, damit Makro-Pausen
+        (delay_ms) nicht die GUI blockieren. on_error(gesture, exception)
+        wird im Hintergrund-Thread aufgerufen.
+        """
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+        self.queue.put((gesture, on_error))
+
+    def _work(self):
+        while True:
+            gesture, on_error = self.queue.get()
+            try:
+                self.run(gesture)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(gesture, e)
+
+    def run(self, gesture):
+        if not self.available:
+            raise RuntimeError("pynput ist nicht installiert")
+        if gesture.keys:
+            self.press_combo(gesture.keys)
+        for step in gesture.macro or []:
+            if 'keys' in step:
+                self.press_combo(step['keys'])
+            elif 'text' in step:
+                self.controller.type(step['text'])
+            elif 'delay_ms' in step:
+                time.sleep(step['delay_ms'] / 1000.0)
+
+    def press_combo(self, combo):
+        keys = [self.special_keys.get(part.strip().lower(), part.strip())
+                for part in combo.split('+')]
+        for key in keys:
+            self.controller.press(key)
+        for key in reversed(keys):
+            self.controller.release(key)
+
+
+def replay_trace(lines, profile):
+    """
+    Spielt eine Trace-Datei ab und gibt [(Zeit_ms, Geste, Latenz_ms)] zurück.
+
+    Zeilenformat (Zeit in ms):
+        0    EVENT LEFT_CLICK
+        120  P 14
+        900  EXPECT Kopieren
+    EXPECT-Zeilen werden übersprungen und von main() ausgewertet.
+    """
+    fired = []
+    recognizer = GestureRecognizer(
+        profile, lambda g, t, latency: fired.append((t * 1000, g.name, latency * 1000)))
+
+    t = 0.0
+    for line in lines:
+        parts = line.split('#', 1)[0].split()
+        if not parts:
+            continue
+        t = float(parts[0]) / 1000.0
+        kind = parts[1].upper()
+        if kind == 'EVENT':
+            recognizer.on_event(t, parts[2])
+        elif kind == 'P':
+            recognizer.on_pressure(t, int(parts[2]))
+        elif kind == 'TICK':
+            recognizer.tick(t)
+    # Nach dem Trace alle wartenden Gesten auslösen
+    deadline = recognizer.engine.next_deadline()
+    if deadline is not None:
+        recognizer.tick(deadline)
+    return fired
+
+
+def _expected(lines):
+    return [line.split()[2] for line in lines
+            if len(line.split()) >= 3 and line.split()[1].upper() == 'EXPECT']
+
+
+def main(argv):
+    if len(argv) < 2:
+        print("Verwendung: python sippuff_gestures.py TRACE [PROFIL.json] [--source samples]")
+        return 2
+
+    profile = {'gestures': DEFAULT_GESTURES}
+    if len(argv) > 2 and not argv[2].startswith('--'):
+        with open(argv[2], 'r') as f:
+            profile.update(json.load(f))
+    if '--source' in argv:
+        profile['gesture_source'] = argv[argv.index('--source') + 1]
+
+    with open(argv[1], 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    fired = replay_trace(lines, profile)
+    for t_ms, name, latency_ms in fired:
+        print(f"{t_ms:8.0f} ms  {name:<15} Latenz {latency_ms:6.1f} ms")
+
+    expected = _expected(lines)
+    if expected:
+        got = [name for _, name, _ in fired]
+        if got != expected:
+            print(f"FEHLER: erwartet {expected}, erkannt {got}")
+            return 1
+        print(f"OK: {len(expected)} Gesten wie erwartet erkannt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -16,6 +16,15 @@ import sys
 import time
 from datetime import datetime
 
+from sippuff_export import DataExporter
+from sippuff_gestures import DEFAULT_GESTURES, GestureRecognizer, KeyboardOutput
+from sippuff_fitts import FittsTestWindow, load_candidates
+from sippuff_calibration import CALIBRATION_SAMPLES, parse_samples, robust_baseline
+from sippuff_diagnostics import DiagnosticsWindow, parse_stats
+from sippuff_analytics import CHECKPOINT_INTERVAL_MS, AnalyticsStore, AnalyticsWindow
+from sippuff_monitor import parse_burst, parse_monitor
+from sippuff_schema import BY_FIRMWARE_KEY, BY_KEY, DEFAULTS, PROFILE_SETTINGS, SETTINGS, decode_settings, encode_command
+
 # PyInstaller-kompatible Pfad-Funktion
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -45,6 +54,7 @@ class SipPuffGUI:
         config_dir = os.path.join(home_dir, ".sippuff")
         if not os.path.exists(config_dir):
             os.makedirs(config_dir)
+        self.config_dir = config_dir
         self.config_file = os.path.join(config_dir, "sippuff_config.json")
         self.default_config_file = os.path.join(config_dir, "sippuff_defaults.json")
         
@@ -62,11 +72,27 @@ class SipPuffGUI:
             'refresh': '↻',      # Refresh-Pfeil
         }
         
+        # Zeigetest-Fenster (Fitts' Law)
+        self.fitts_window = None
+        
+        # Diagnose-Fenster (Firmware-Telemetrie)
+        self.diagnostics_window = None
+        
+        # Nutzungsstatistik (eine Sitzung pro Verbindung)
+        self.analytics = AnalyticsStore(os.path.join(config_dir, "analytics"))
+        self.analytics_window = None
+        self.analytics_job = None
+        
         # Drucktest-Fenster
         self.pressure_test_window = None
         self.pressure_test_active = False
         self.pressure_update_pending = False  # Verhindere Update-Stau
         
+        # Monitor-Modus (Telemetrie bei laufendem Maus-Betrieb)
+        self.monitor_active = False
+        self.monitor_update_pending = False
+        self.last_action_time = 0.0  # Bezugszeit für nachgelieferte Burst-Samples
+        
         # Erweiterte Einstellungen ausklappbar
         self.advanced_expanded = False
         
@@ -74,25 +100,42 @@ class SipPuffGUI:
         self.receiving_settings = False
         self.arduino_settings = {}
         
+        # Abonnenten des Live-Streams (on_pressure, on_joystick, on_event)
+        # Copy-on-write: jede Änderung setzt ein neues Tupel, publish() iteriert über einen Schnappschuss
+        self.stream_subscribers = ()
+        
+        # Daten-Export (CSV + Spaltenformat) in ~/.sippuff/exports
+        # Schreibfehler kommen aus dem Writer-Thread -> im Tk-Thread behandeln
+        self.exporter = DataExporter(os.path.join(config_dir, "exports"),
+                                     on_error=lambda e: self.root.after(0, self.on_export_error, e))
+        
+        # Host-Kalibrierung (Startzeitpunkt für Dauer-Messung)
+        self.calibration_started = None
+        
+        # Gesten-Erkennung (wird beim Aktivieren aus dem Profil gebaut)
+        self.gesture_recognizer = None
+        self.gesture_tick_job = None
+        self.keyboard_output = KeyboardOutput()
+        
+        # Widgets der Schema-Einstellungen (werden in create_widgets erzeugt)
+        self.setting_vars = {}
+        self.setting_entries = {}
+        
         self.create_widgets()
         self.load_config()
         
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def load_defaults(self):
         """Lädt Standard-Werte aus JSON oder erstellt die Datei"""
-        default_values = {
-            'click_left': 10,      
-            'click_double': 15,    
-            'click_right': -10,    
-            'scroll_up': -5,       
-            'scroll_down': 5,      
-            'scroll_speed': 1,     
-            'scroll_enabled': True,
-            'wavelength': 15,
-            'period': 35,
-            'deadzone': 25,
-            'debounce': 500,
-            'joystick_enabled': True
-        }
+        # Geräte-Einstellungen aus dem Schema, dazu die GUI-eigenen Gesten-Einträge
+        default_values = dict(DEFAULTS)
+        default_values.update({
+            'gestures_enabled': False,
+            'gesture_source': 'events',  # "events" (ACTION-Meldungen) oder "samples" (Druckwerte)
+            'gesture_hold_ms': 600,
+            'gestures': DEFAULT_GESTURES
+        })
         
         # Prüfe ob Defaults-Datei existiert
         if os.path.exists(self.default_config_file):
@@ -137,6 +180,13 @@ class SipPuffGUI:
                                               state="disabled")  # Deaktiviert bis verbunden
         self.pressure_test_btn.pack(side="right", padx=5)
         
+        # Export-Button
+        self.export_btn = ctk.CTkButton(header, text="Export starten",
+                                        command=self.toggle_export,
+                                        width=140,
+                                        font=ctk.CTkFont(size=13, weight="bold"))
+        self.export_btn.pack(side="right", padx=5)
+        
         # Scrollbarer Container für die einzelnen Blöcke
         scrollable_container = ctk.CTkScrollableFrame(self.root, corner_radius=10, fg_color="transparent")
         scrollable_container.pack(fill="both", expand=True, padx=20, pady=(0, 10))
@@ -174,12 +224,10 @@ class SipPuffGUI:
                                    font=ctk.CTkFont(size=16, weight="bold"))
         click_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
         
-        self.create_slider(click_frame, "Linksklick (Puff):", 'click_left', 0, 400, 1, tooltip="Pusten: Positiver Wert für Linksklick")
-        self.create_slider(click_frame, "Doppelklick (Puff stark):", 'click_double', 0, 400, 2, tooltip="Stärkeres Pusten: Höherer positiver Wert für Doppelklick")
-        self.create_slider(click_frame, "Rechtsklick (Sip):", 'click_right', -400, 0, 3, tooltip="Saugen: Negativer Wert für Rechtsklick")
+        row = self.create_setting_widgets(click_frame, 'click')
         
         # Spacing
-        ctk.CTkLabel(click_frame, text="").grid(row=4, column=0, pady=5)
+        ctk.CTkLabel(click_frame, text="").grid(row=row, column=0, pady=5)
         
         # Erweiterte Einstellungen (ausklappbar)
         advanced_container = ctk.CTkFrame(main_frame, corner_radius=10)
@@ -214,24 +262,10 @@ class SipPuffGUI:
                                     font=ctk.CTkFont(size=14, weight="bold"))
         scroll_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
         
-        # Checkbox für Scroll-Aktivierung
-        self.scroll_var = ctk.BooleanVar(value=True)
-        self.scroll_check = ctk.CTkCheckBox(scroll_frame, text="Scroll aktiviert", 
-                                           variable=self.scroll_var,
-                                           command=self.on_scroll_toggle,
-                                           font=ctk.CTkFont(size=12, weight="bold"),
-                                           border_width=1)
-        self.scroll_check.grid(row=1, column=0, columnspan=3, sticky="w", padx=15, pady=10)
-        
-        self.create_slider(scroll_frame, "Scroll Up (Sip leicht):", 'scroll_up', -400, 0, 2, 
-                          tooltip="Leichtes Saugen: Scrollt nach oben (sollte > Rechtsklick sein)")
-        self.create_slider(scroll_frame, "Scroll Down (Puff leicht):", 'scroll_down', 0, 400, 3, 
-                          tooltip="Leichtes Pusten: Scrollt nach unten (sollte < Linksklick sein)")
-        self.create_slider(scroll_frame, "Scroll-Geschwindigkeit:", 'scroll_speed', 1, 5, 4, 
-                          tooltip="Scroll-Speed: 1=langsam, 5=schnell")
+        row = self.create_setting_widgets(scroll_frame, 'scroll')
         
         # Spacing
-        ctk.CTkLabel(scroll_frame, text="").grid(row=5, column=0, pady=5)
+        ctk.CTkLabel(scroll_frame, text="").grid(row=row, column=0, pady=5)
         
         # Joystick-Schwellwerte
         joy_frame = ctk.CTkFrame(self.advanced_content, corner_radius=10, fg_color=("gray90", "gray25"))
@@ -240,21 +274,10 @@ class SipPuffGUI:
         joy_title = ctk.CTkLabel(joy_frame, text="Joystick", font=ctk.CTkFont(size=14, weight="bold"))
         joy_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
         
-        # Checkbox für Joystick-Aktivierung
-        self.joystick_var = ctk.BooleanVar(value=True)
-        self.joystick_check = ctk.CTkCheckBox(joy_frame, text="Joystick aktiviert", 
-                                             variable=self.joystick_var,
-                                             command=self.on_joystick_toggle,
-                                             font=ctk.CTkFont(size=12, weight="bold"),
-                                             border_width=1)
-        self.joystick_check.grid(row=1, column=0, columnspan=3, sticky="w", padx=15, pady=10)
-        
-        self.create_slider(joy_frame, "Geschwindigkeit:", 'wavelength', 5, 50, 2, tooltip="Höher = schneller")
-        self.create_slider(joy_frame, "Update-Rate (ms):", 'period', 10, 100, 3, tooltip="Kleiner = flüssiger (25-50 empfohlen)")
-        self.create_slider(joy_frame, "Deadzone:", 'deadzone', 0, 100, 4, tooltip="Bereich ohne Bewegung um Mittelposition")
+        row = self.create_setting_widgets(joy_frame, 'joystick')
         
         # Spacing
-        ctk.CTkLabel(joy_frame, text="").grid(row=5, column=0, pady=5)
+        ctk.CTkLabel(joy_frame, text="").grid(row=row, column=0, pady=5)
         
         adv_frame = ctk.CTkFrame(self.advanced_content, corner_radius=10, fg_color=("gray90", "gray25"))
         adv_frame.pack(fill="x", pady=(0, 10), padx=15)
@@ -262,10 +285,65 @@ class SipPuffGUI:
         adv_title = ctk.CTkLabel(adv_frame, text="Weitere Einstellungen", font=ctk.CTkFont(size=14, weight="bold"))
         adv_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
         
-        self.create_slider(adv_frame, "Debounce (ms):", 'debounce', 100, 1000, 1, tooltip="Mindestzeit zwischen Klicks")
+        row = self.create_setting_widgets(adv_frame, 'advanced')
         
         # Spacing
-        ctk.CTkLabel(adv_frame, text="").grid(row=2, column=0, pady=5)
+        ctk.CTkLabel(adv_frame, text="").grid(row=row, column=0, pady=5)
+        
+        # Gesten (Sip/Puff-Folgen -> Tastenkürzel)
+        gesture_frame = ctk.CTkFrame(self.advanced_content, corner_radius=10, fg_color=("gray90", "gray25"))
+        gesture_frame.pack(fill="x", pady=(0, 10), padx=15)
+        
+        gesture_title = ctk.CTkLabel(gesture_frame, text="Gesten", font=ctk.CTkFont(size=14, weight="bold"))
+        gesture_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
+        
+        # Checkbox für Gesten-Aktivierung
+        self.gesture_toggle_var = ctk.BooleanVar(value=False)
+        self.gesture_check = ctk.CTkCheckBox(gesture_frame, text="Gesten aktiviert",
+                                             variable=self.gesture_toggle_var,
+                                             command=self.on_gestures_toggle,
+                                             font=ctk.CTkFont(size=12, weight="bold"),
+                                             border_width=1)
+        self.gesture_check.grid(row=1, column=0, columnspan=3, sticky="w", padx=15, pady=10)
+        
+        self.gesture_list_label = ctk.CTkLabel(gesture_frame, text="", justify="left",
+                                               font=ctk.CTkFont(size=11), text_color="gray")
+        self.gesture_list_label.grid(row=2, column=0, columnspan=3, sticky="w", padx=15, pady=(0, 15))
+        self.update_gesture_list()
+        
+        # Werkzeuge
+        tools_frame = ctk.CTkFrame(main_frame, corner_radius=10)
+        tools_frame.pack(fill="x", pady=(0, 10))
+        
+        tools_title = ctk.CTkLabel(tools_frame, text="Werkzeuge", font=ctk.CTkFont(size=16, weight="bold"))
+        tools_title.grid(row=0, column=0, columnspan=3, sticky="w", padx=15, pady=(15, 10))
+        
+        self.fitts_btn = ctk.CTkButton(tools_frame, text="Zeigetest (Fitts)",
+                                       command=self.open_fitts_test, width=140, state="disabled",
+                                       font=ctk.CTkFont(size=12))
+        self.fitts_btn.grid(row=1, column=0, sticky="w", padx=15, pady=(0, 15))
+        self.create_tooltip(self.fitts_btn, "Vergleicht Profile aus ~/.sippuff/fitts_profiles.json (Durchsatz in bits/s)")
+        
+        self.diagnostics_btn = ctk.CTkButton(tools_frame, text="Diagnose",
+                                             command=self.open_diagnostics, width=140, state="disabled",
+                                             font=ctk.CTkFont(size=12))
+        self.diagnostics_btn.grid(row=1, column=1, sticky="w", padx=5, pady=(0, 15))
+        self.create_tooltip(self.diagnostics_btn, "Loop-Timing, ausgefallene Joystick-Updates und Serial-Rückstau")
+        
+        self.analytics_btn = ctk.CTkButton(tools_frame, text="Statistik",
+                                           command=self.open_analytics, width=140,
+                                           font=ctk.CTkFont(size=12))
+        self.analytics_btn.grid(row=1, column=2, sticky="w", padx=5, pady=(0, 15))
+        self.create_tooltip(self.analytics_btn, "Klicks pro Stunde, Fehlklicks und Sitzungsdauer über Tage/Monate")
+        
+        self.monitor_btn = ctk.CTkButton(tools_frame, text="Monitor starten",
+                                         command=self.toggle_monitor, width=140, state="disabled",
+                                         font=ctk.CTkFont(size=12))
+        self.monitor_btn.grid(row=2, column=0, sticky="w", padx=15, pady=(0, 15))
+        self.create_tooltip(self.monitor_btn, "Druck und Joystick live mitlesen, Maus bleibt aktiv (Export, Gesten, Statistik)")
+        
+        self.monitor_label = ctk.CTkLabel(tools_frame, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        self.monitor_label.grid(row=2, column=1, columnspan=2, sticky="w", padx=5, pady=(0, 15))
         
         # Log-Bereich
         log_frame = ctk.CTkFrame(main_frame, corner_radius=10)
@@ -303,14 +381,40 @@ class SipPuffGUI:
                                       font=ctk.CTkFont(size=12))
         self.reset_btn.pack(side="left", padx=5)
         
-    def create_slider(self, parent, label, key, from_, to, row, tooltip=""):
-        ctk.CTkLabel(parent, text=label, font=ctk.CTkFont(size=12)).grid(
+    def create_setting_widgets(self, parent, group):
+        """Erzeugt Checkboxen/Slider für alle Schema-Einstellungen einer Gruppe ab Zeile 1"""
+        row = 1
+        for setting in SETTINGS:
+            if setting.group != group:
+                continue
+            if setting.is_bool:
+                self.create_toggle(parent, setting, row)
+            else:
+                self.create_slider(parent, setting, row)
+            row += 1
+        return row
+        
+    def create_toggle(self, parent, setting, row):
+        key = setting.key
+        value_var = ctk.BooleanVar(value=self.current_values[key])
+        check = ctk.CTkCheckBox(parent, text=setting.label,
+                                variable=value_var,
+                                command=lambda: self.on_toggle(key),
+                                font=ctk.CTkFont(size=12, weight="bold"),
+                                border_width=1)
+        check.grid(row=row, column=0, columnspan=3, sticky="w", padx=15, pady=10)
+        
+        self.setting_vars[key] = value_var
+        
+    def create_slider(self, parent, setting, row):
+        key = setting.key
+        ctk.CTkLabel(parent, text=setting.label, font=ctk.CTkFont(size=12)).grid(
             row=row, column=0, sticky="w", padx=15, pady=8)
         
         value_var = ctk.IntVar(value=self.current_values[key])
         
         # Slider 
-        slider = ctk.CTkSlider(parent, from_=from_, to=to, 
+        slider = ctk.CTkSlider(parent, from_=setting.minimum, to=setting.maximum, 
                               variable=value_var, width=300,
                               command=lambda v: self.on_slider_change(key, v))
         slider.grid(row=row, column=1, padx=10, pady=8)
@@ -321,18 +425,14 @@ class SipPuffGUI:
         value_entry.insert(0, str(self.current_values[key]))
         value_entry.grid(row=row, column=2, padx=15, pady=8)
         
-        # Event-Handler für manuelles Editieren
+        # Event-Handler für manuelles Editieren (Bereich aus dem Schema)
         def on_entry_change(event):
             try:
-                new_value = int(value_entry.get())
-                if from_ <= new_value <= to:
-                    value_var.set(new_value)
-                    self.current_values[key] = new_value
-                    if self.connected:
-                        self.send_setting(key, new_value)
-                else:
-                    value_entry.delete(0, "end")
-                    value_entry.insert(0, str(self.current_values[key]))
+                new_value = setting.validate(value_entry.get())
+                value_var.set(new_value)
+                self.current_values[key] = new_value
+                if self.connected:
+                    self.send_setting(key, new_value)
             except ValueError:
                 value_entry.delete(0, "end")
                 value_entry.insert(0, str(self.current_values[key]))
@@ -341,12 +441,12 @@ class SipPuffGUI:
         value_entry.bind("<FocusOut>", on_entry_change)
         
         # Tooltip
-        if tooltip:
-            self.create_tooltip(slider, tooltip)
+        if setting.tooltip:
+            self.create_tooltip(slider, setting.tooltip)
         
         # Speichere Referenzen
-        setattr(self, f"{key}_var", value_var)
-        setattr(self, f"{key}_entry", value_entry)
+        self.setting_vars[key] = value_var
+        self.setting_entries[key] = value_entry
         
     def create_tooltip(self, widget, text):
         def on_enter(event):
@@ -397,14 +497,24 @@ class SipPuffGUI:
             self.status_label.configure(text="● Verbunden", text_color="green")
             self.recal_btn.configure(state="normal")
             self.pressure_test_btn.configure(state="normal")  # Drucktest aktivieren
+            self.fitts_btn.configure(state="normal")  # Zeigetest aktivieren
+            self.diagnostics_btn.configure(state="normal")  # Diagnose aktivieren
+            self.monitor_btn.configure(state="normal")  # Monitor aktivieren
             self.save_arduino_btn.configure(state="normal")  # Arduino-Speicher aktivieren
             self.log(f"Verbunden mit {port}")
             
+            # Statistik-Sitzung starten
+            self.analytics.start_session()
+            self.add_subscriber(self.analytics)
+            self.analytics_job = self.root.after(CHECKPOINT_INTERVAL_MS, self.checkpoint_analytics)
+            
             # Starte Empfangs-Thread
             self.read_thread = threading.Thread(target=self.read_serial, daemon=True)
             self.read_thread.start()
             
-            # Arduino sendet automatisch seine Settings beim Start
+            # Monitor einer früheren Verbindung beenden (Absturz, Kabel gezogen),
+            # dann Einstellungen anfordern (der Arduino sendet sie sonst nur beim Start)
+            self.serial_connection.write(b"MONITOR:STOP\nGET:SETTINGS\n")
             self.log("Warte auf Arduino-Einstellungen...")
             
         except Exception as e:
@@ -417,12 +527,31 @@ class SipPuffGUI:
             if self.pressure_test_active:
                 self.close_pressure_test()
             
+            # Diagnose-Polling stoppen
+            if self.diagnostics_window is not None and self.diagnostics_window.exists():
+                self.diagnostics_window.close()
+            
+            # Monitor-Stream beenden
+            if self.monitor_active:
+                self.toggle_monitor()
+            
             self.serial_connection.close()
             self.connected = False
+            
+            # Statistik-Sitzung abschließen
+            self.remove_subscriber(self.analytics)
+            if self.analytics_job is not None:
+                self.root.after_cancel(self.analytics_job)
+                self.analytics_job = None
+            self.analytics.end_session()
+            
             self.connect_btn.configure(text="Verbinden")
             self.status_label.configure(text="● Nicht verbunden", text_color="red")
             self.recal_btn.configure(state="disabled")
             self.pressure_test_btn.configure(state="disabled")  # Drucktest deaktivieren
+            self.fitts_btn.configure(state="disabled")  # Zeigetest deaktivieren
+            self.diagnostics_btn.configure(state="disabled")  # Diagnose deaktivieren
+            self.monitor_btn.configure(state="disabled")  # Monitor deaktivieren
             self.save_arduino_btn.configure(state="disabled")  # Arduino-Speicher deaktivieren
             self.log("Verbindung getrennt")
             
@@ -434,20 +563,63 @@ class SipPuffGUI:
                     # WICHTIG: Entferne auch \r explizit (Windows Line Endings)
                     line = line.replace('\r', '').replace('\n', '')
                     if line:
-                        # Debug-Ausgabe nur wenn NICHT im Drucktest (zu viel Output)
-                        if not self.pressure_test_active:
+                        # Debug-Ausgabe nur wenn NICHT im Drucktest/Monitor (zu viel Output)
+                        if not self.pressure_test_active and not self.monitor_active:
                             print(f"DEBUG read_serial: '{line}'")
                         self.process_serial_message(line)
             except Exception as e:
                 self.log(f"Lesefehler: {e}")
                 break
                 
+    def add_subscriber(self, subscriber):
+        self.stream_subscribers = self.stream_subscribers + (subscriber,)
+    
+    def remove_subscriber(self, subscriber):
+        self.stream_subscribers = tuple(s for s in self.stream_subscribers if s is not subscriber)
+    
+    def publish(self, method, *args, skip=None):
+        """Verteilt einen Stream-Datensatz an alle Abonnenten außer skip (Aufruf aus dem Lese-Thread)"""
+        for subscriber in self.stream_subscribers:
+            if subscriber is not skip:
+                getattr(subscriber, method)(*args)
+    
     def process_serial_message(self, msg):
+        timestamp = time.time()
+        
+        # Monitor-Stream: direkt an die Abonnenten, Anzeige gedrosselt
+        # (Zeilen ohne aktiven Monitor stammen aus einer früheren Verbindung)
+        if msg.startswith("M:"):
+            if not self.monitor_active:
+                return
+            try:
+                pressure, x, y = parse_monitor(msg)
+            except ValueError:
+                return
+            self.publish('on_pressure', timestamp, pressure)
+            self.publish('on_joystick', timestamp, x, y)
+            if not self.monitor_update_pending:
+                self.monitor_update_pending = True
+                self.root.after(0, self._do_monitor_update, pressure, x, y)
+            return
+        if msg.startswith("MB:"):
+            if not self.monitor_active:
+                return
+            # Nachgelieferte Samples vor dem letzten Klick (Zeit relativ zum ACTION-Empfang)
+            try:
+                burst = parse_burst(msg)
+            except ValueError:
+                return
+            for age_ms, pressure in burst:
+                self.publish('on_pressure', self.last_action_time - age_ms / 1000, pressure)
+            return
+        
         # Im Drucktest-Modus: Interpretiere jede Zeile direkt als Zahl
         if self.pressure_test_active:
             try:
                 # Versuche direkt als Zahl zu parsen
                 pressure_value = int(msg.strip())
+                # Einstell-Pustes im Drucktest zählen nicht zur Nutzungsstatistik
+                self.publish('on_pressure', timestamp, pressure_value, skip=self.analytics)
                 
                 # Throttling: Nur updaten wenn kein Update läuft
                 if not self.pressure_update_pending:
@@ -458,9 +630,18 @@ class SipPuffGUI:
             except ValueError:
                 pass
         
+        # Werte des SETTINGS-Dumps kommen als KEY:Wert-Zeilen zwischen START und END
+        if self.receiving_settings:
+            key, separator, value = msg.partition(":")
+            if separator and key in BY_FIRMWARE_KEY:
+                self.arduino_settings[key] = value
+                return
+        
         # Normale Verarbeitung (außerhalb Drucktest)
         if msg.startswith("ACTION:"):
             action = msg.split(":")[1]
+            self.last_action_time = timestamp
+            self.publish('on_event', timestamp, action)
             action_names = {
                 'LEFT_CLICK': '→ Linksklick',
                 'DOUBLE_CLICK': '→→ Doppelklick',
@@ -471,6 +652,23 @@ class SipPuffGUI:
             # Bestätigung erhalten
             if "PRESSURE_TEST" in msg:
                 print(f"DEBUG: {msg}")
+        elif msg.startswith("STATS:"):
+            # Firmware-Telemetrie für das Diagnose-Fenster (gestörte Zeile wird verworfen)
+            if self.diagnostics_window is not None:
+                try:
+                    stats = parse_stats(msg)
+                except (ValueError, KeyError) as e:
+                    print(f"DEBUG: STATS-Zeile verworfen: {e}")
+                    return
+                self.root.after(0, self.diagnostics_window.add_stats, stats)
+        elif msg.startswith("CAL:DATA:"):
+            # Rohwerte der Host-Kalibrierung (gestörte Zeile darf den Lese-Thread nicht beenden)
+            try:
+                samples = parse_samples(msg)
+            except ValueError as e:
+                self.log(f"⚠ Ungültige Kalibrierdaten verworfen: {e}")
+                return
+            self.root.after(0, self.apply_calibration, samples)
         elif msg.startswith("INFO:"):
             info = msg.split(":", 1)[1]
             self.log(f"ℹ {info}")
@@ -479,17 +677,9 @@ class SipPuffGUI:
             if msg == "SETTINGS:START":
                 self.receiving_settings = True
                 self.arduino_settings = {}
-            elif msg == "SETTINGS:END":
+            elif msg == "SETTINGS:END" and self.receiving_settings:
                 self.receiving_settings = False
-                self.root.after(0, self.apply_arduino_settings)
-            elif self.receiving_settings:
-                try:
-                    parts = msg.replace("SETTINGS:", "").split(":", 1)
-                    if len(parts) == 2:
-                        key, value = parts
-                        self.arduino_settings[key] = value
-                except:
-                    pass
+                self.root.after(0, self.apply_arduino_settings, self.arduino_settings)
         else:
             # Andere Nachrichten loggen
             self.log(msg)
@@ -499,65 +689,39 @@ class SipPuffGUI:
         self.current_values[key] = value
         
         # Update Entry-Feld
-        entry = getattr(self, f"{key}_entry")
+        entry = self.setting_entries[key]
         entry.delete(0, "end")
         entry.insert(0, str(value))
         
         if self.connected:
             self.send_setting(key, value)
             
-    def on_joystick_toggle(self):
-        enabled = self.joystick_var.get()
-        self.current_values['joystick_enabled'] = enabled
-        
-        if self.connected:
-            self.send_setting('joystick', 1 if enabled else 0)
-            self.log(f"Joystick {'aktiviert' if enabled else 'deaktiviert'}")
-    
-    def on_scroll_toggle(self):
-        enabled = self.scroll_var.get()
-        self.current_values['scroll_enabled'] = enabled
+    def on_toggle(self, key):
+        enabled = self.setting_vars[key].get()
+        self.current_values[key] = enabled
         
         if self.connected:
-            self.send_setting('scroll', 1 if enabled else 0)
-            self.log(f"Scroll {'aktiviert' if enabled else 'deaktiviert'}")
+            self.send_setting(key, enabled)
+            self.log(f"{BY_KEY[key].label} {'aktiviert' if enabled else 'deaktiviert'}")
             
     def send_setting(self, key, value):
         if not self.connected or not self.serial_connection:
             return
-            
-        key_map = {
-            'click_left': 'CLICK_LEFT',
-            'click_double': 'CLICK_DOUBLE',
-            'click_right': 'CLICK_RIGHT',
-            'scroll_up': 'SCROLL_UP',       
-            'scroll_down': 'SCROLL_DOWN',   
-            'scroll_speed': 'SCROLL_SPEED', 
-            'scroll': 'SCROLL',
-            'wavelength': 'WAVELENGTH',
-            'period': 'PERIOD',
-            'deadzone': 'DEADZONE',
-            'debounce': 'DEBOUNCE',
-            'joystick': 'JOYSTICK'
-        }
-        
-        arduino_key = key_map.get(key, key.upper())
-        command = f"SET:{arduino_key}:{value}\n"
         
         try:
-            self.serial_connection.write(command.encode())
+            self.serial_connection.write(encode_command(key, value))
         except Exception as e:
             self.log(f"Sendefehler: {e}")
             
+    def send_value(self, key, value):
+        """Sendet einen Profil-Wert (GUI-Schlüssel) an Arduino, GUI-eigene Einträge werden übersprungen"""
+        if key in BY_KEY and BY_KEY[key].profile:
+            self.send_setting(key, value)
+            
     def sync_all_settings(self):
         """Sendet alle aktuellen Einstellungen an Arduino"""
-        for key, value in self.current_values.items():
-            if key == 'joystick_enabled':
-                self.send_setting('joystick', 1 if value else 0)
-            elif key == 'scroll_enabled':
-                self.send_setting('scroll', 1 if value else 0)
-            else:
-                self.send_setting(key, value)
+        for setting in PROFILE_SETTINGS:
+            self.send_setting(setting.key, self.current_values[setting.key])
         self.log("Einstellungen synchronisiert")
         
     def recalibrate(self):
@@ -565,10 +729,31 @@ class SipPuffGUI:
             return
             
         try:
-            self.serial_connection.write(b"RECALIBRATE\n")
-            self.log("Rekalibrierung gestartet...")
+            # Arduino streamt Rohwerte, die GUI berechnet den Nullpunkt robust
+            self.calibration_started = time.perf_counter()
+            self.serial_connection.write(f"CALIBRATE:SAMPLES:{CALIBRATION_SAMPLES}\n".encode())
+            self.log("Rekalibrierung gestartet - bitte NICHT pusten/saugen...")
         except Exception as e:
             self.log(f"Fehler: {e}")
+    
+    def apply_calibration(self, samples):
+        """Berechnet den Nullpunkt aus den Rohwerten und schreibt ihn zurück"""
+        if not samples:
+            return
+        result = robust_baseline(samples)
+        duration = ""
+        if self.calibration_started is not None:
+            duration = f", {(time.perf_counter() - self.calibration_started) * 1000:.0f} ms"
+            self.calibration_started = None
+        
+        if not result.valid:
+            self.log(f"⚠ Kalibrierung verworfen: {result.outliers} von {len(samples)} Samples "
+                     f"gestört - bitte wiederholen ohne zu pusten/saugen")
+            return
+        
+        self.send_setting('baseline', result.baseline)
+        self.log(f"✓ Kalibrierung: Nullpunkt {result.baseline} "
+                 f"({len(samples)} Samples, {result.outliers} Ausreißer verworfen{duration})")
             
     def save_config(self):
         try:
@@ -641,17 +826,16 @@ class SipPuffGUI:
             self.log("Auf Standard zurückgesetzt")
             
     def update_ui_from_values(self):
-        for key, value in self.current_values.items():
-            if key == 'joystick_enabled':
-                self.joystick_var.set(value)
-            elif key == 'scroll_enabled':
-                self.scroll_var.set(value)
-            elif hasattr(self, f"{key}_var"):
-                var = getattr(self, f"{key}_var")
-                var.set(value)
-                entry = getattr(self, f"{key}_entry")
+        for key, var in self.setting_vars.items():
+            value = self.current_values[key]
+            var.set(value)
+            if key in self.setting_entries:
+                entry = self.setting_entries[key]
                 entry.delete(0, "end")
                 entry.insert(0, str(value))
+        
+        self.gesture_toggle_var.set(self.current_values['gestures_enabled'])
+        self.on_gestures_toggle()
     
     def _do_pressure_update(self, pressure_value):
         """Führt das Drucktest-Update aus und setzt Flag zurück"""
@@ -676,41 +860,16 @@ class SipPuffGUI:
             self.advanced_info.configure(text="(Klick zum Aufklappen)")
             self.advanced_content.pack_forget()
     
-    def apply_arduino_settings(self):
-        """Übernimmt Einstellungen vom Arduino in die GUI"""
-        key_map = {
-            'CLICK_LEFT': 'click_left',
-            'CLICK_DOUBLE': 'click_double',
-            'CLICK_RIGHT': 'click_right',
-            'SCROLL_UP': 'scroll_up',
-            'SCROLL_DOWN': 'scroll_down',
-            'SCROLL_SPEED': 'scroll_speed',
-            'SCROLL': 'scroll_enabled',
-            'WAVELENGTH': 'wavelength',
-            'PERIOD': 'period',
-            'DEADZONE': 'deadzone',
-            'DEBOUNCE': 'debounce',
-            'JOYSTICK': 'joystick_enabled'
-        }
-        
-        settings_updated = False
-        
-        for arduino_key, value_str in self.arduino_settings.items():
-            if arduino_key in key_map:
-                gui_key = key_map[arduino_key]
-                
-                try:
-                    if gui_key in ['scroll_enabled', 'joystick_enabled']:
-                        value = (value_str == '1' or value_str.upper() == 'TRUE')
-                    else:
-                        value = int(value_str)
-                    
-                    self.current_values[gui_key] = value
-                    settings_updated = True
-                except:
-                    pass
-        
-        if settings_updated:
+    def apply_arduino_settings(self, raw):
+        """Übernimmt Einstellungen vom Arduino (SETTINGS-Dump) in die GUI"""
+        values, errors = decode_settings(raw)
+        for error in errors:
+            self.log(f"⚠ Ungültiger Wert vom Arduino: {error}")
+        
+        # Nur Profil-Werte übernehmen (Nullpunkt bleibt Gerätewert)
+        values = {key: value for key, value in values.items() if BY_KEY[key].profile}
+        if values:
+            self.current_values.update(values)
             self.update_ui_from_values()
             self.log("✓ Einstellungen vom Arduino geladen")
     
@@ -816,6 +975,32 @@ class SipPuffGUI:
         
         self.log("Drucktest beendet")
     
+    def toggle_monitor(self):
+        """Startet/stoppt den Monitor-Stream (Maus bleibt aktiv)"""
+        if not self.connected or not self.serial_connection:
+            return
+        self.monitor_active = not self.monitor_active
+        try:
+            self.serial_connection.write(b"MONITOR:START\n" if self.monitor_active else b"MONITOR:STOP\n")
+        except Exception as e:
+            self.log(f"Sendefehler: {e}")
+        
+        if self.monitor_active:
+            self.monitor_btn.configure(text="Monitor stoppen")
+            self.log("Monitor gestartet")
+        else:
+            self.monitor_btn.configure(text="Monitor starten")
+            self.monitor_label.configure(text="")
+            self.log("Monitor beendet")
+    
+    def _do_monitor_update(self, pressure, x, y):
+        """Zeigt den letzten Monitor-Wert an und setzt Flag zurück"""
+        try:
+            if self.monitor_active:
+                self.monitor_label.configure(text=f"Druck: {pressure:+d}   Joystick: {x} / {y}")
+        finally:
+            self.monitor_update_pending = False
+    
     def update_pressure_display(self, pressure_value):
         """Aktualisiert die Drucktest-Anzeige"""
         
@@ -852,6 +1037,143 @@ class SipPuffGUI:
         # Update Progressbar
         self.pressure_progress.set(progress_value)
                 
+    def on_gestures_toggle(self):
+        """Baut die Gesten-Erkennung aus dem aktuellen Profil (neu) auf"""
+        enabled = self.gesture_toggle_var.get()
+        self.current_values['gestures_enabled'] = enabled
+        
+        if self.gesture_recognizer is not None:
+            self.remove_subscriber(self.gesture_recognizer)
+            self.gesture_recognizer = None
+        
+        if enabled:
+            try:
+                self.gesture_recognizer = GestureRecognizer(self.current_values, self.on_gesture)
+            except (KeyError, ValueError) as e:
+                self.log(f"Fehler in Gesten-Tabelle: {e}")
+                self.gesture_toggle_var.set(False)
+                self.current_values['gestures_enabled'] = False
+                return
+            self.add_subscriber(self.gesture_recognizer)
+            if self.gesture_tick_job is None:
+                self.tick_gestures()
+            if not self.keyboard_output.available:
+                self.log("⚠ pynput nicht installiert - Gesten werden nur geloggt")
+        self.update_gesture_list()
+    
+    def tick_gestures(self):
+        """Löst wartende Gesten nach Ablauf ihrer Lücke aus (alle 20 ms)"""
+        if self.gesture_recognizer is None:
+            self.gesture_tick_job = None
+            return
+        self.gesture_recognizer.tick(time.time())
+        self.gesture_tick_job = self.root.after(20, self.tick_gestures)
+    
+    def on_gesture(self, gesture, t, latency):
+        # Kann aus dem Lese-Thread kommen: Ausführung im GUI-Thread
+        self.root.after(0, self.run_gesture, gesture, latency)
+    
+    def run_gesture(self, gesture, latency):
+        self.log(f"✋ Geste: {gesture.name} ({latency * 1000:.0f} ms)")
+        if self.keyboard_output.available:
+            # Makros laufen im Hintergrund-Thread (delay_ms würde sonst die GUI einfrieren)
+            self.keyboard_output.submit(
+                gesture, lambda g, e: self.root.after(0, self.log, f"Fehler bei Geste {g.name}: {e}"))
+    
+    def update_gesture_list(self):
+        lines = [f"{' → '.join(g['sequence'])}:  {g['name']} ({g.get('keys') or 'Makro'})"
+                 for g in self.current_values.get('gestures', [])]
+        self.gesture_list_label.configure(text="\n".join(lines) or "Keine Gesten im Profil")
+    
+    def open_fitts_test(self):
+        """Öffnet den Zeigetest, der die Kandidaten-Profile nacheinander testet"""
+        if self.fitts_window is not None and self.fitts_window.exists():
+            self.fitts_window.focus()
+            return
+        
+        try:
+            candidates = load_candidates(os.path.join(self.config_dir, "fitts_profiles.json"))
+        except Exception as e:
+            self.log(f"Fehler beim Laden der Zeigetest-Profile: {e}")
+            return
+        
+        self.fitts_window = FittsTestWindow(self.root, candidates, dict(self.current_values),
+                                            os.path.join(self.config_dir, "fitts"),
+                                            self.send_value, self.sync_all_settings, self.log)
+        self.log(f"Zeigetest gestartet ({len(candidates)} Profile)")
+    
+    def open_diagnostics(self):
+        """Öffnet die Gerätediagnose (pollt GET:STATS einmal pro Sekunde)"""
+        if self.diagnostics_window is not None and self.diagnostics_window.exists():
+            self.diagnostics_window.focus()
+            return
+        
+        self.diagnostics_window = DiagnosticsWindow(self.root, self.request_stats)
+    
+    def request_stats(self):
+        if not self.connected or not self.serial_connection:
+            return
+        try:
+            self.serial_connection.write(b"GET:STATS\n")
+        except Exception as e:
+            self.log(f"Sendefehler: {e}")
+    
+    def checkpoint_analytics(self):
+        """Sichert die laufende Statistik-Sitzung regelmäßig (Absturzschutz)"""
+        try:
+            self.analytics.checkpoint()
+        except Exception as e:
+            self.log(f"Statistik-Fehler: {e}")
+        self.analytics_job = self.root.after(CHECKPOINT_INTERVAL_MS, self.checkpoint_analytics)
+    
+    def open_analytics(self):
+        """Öffnet die Nutzungsstatistik"""
+        if self.analytics_window is not None and self.analytics_window.exists():
+            self.analytics_window.focus()
+            self.analytics_window.refresh()
+            return
+        
+        self.analytics_window = AnalyticsWindow(self.root, self.analytics)
+    
+    def toggle_export(self):
+        """Startet/stoppt den Hintergrund-Export des Live-Streams"""
+        if self.exporter not in self.stream_subscribers:
+            try:
+                session_dir = self.exporter.start()
+            except Exception as e:
+                self.log(f"Exportfehler: {e}")
+                return
+            self.add_subscriber(self.exporter)
+            self.export_btn.configure(text="Export stoppen")
+            self.log(f"Export gestartet: {session_dir}")
+        else:
+            self.finish_export()
+    
+    def finish_export(self):
+        """Beendet den Export und meldet Ergebnis oder Schreibfehler"""
+        self.remove_subscriber(self.exporter)
+        error = self.exporter.stop()
+        self.export_btn.configure(text="Export starten")
+        if error is not None:
+            self.log(f"Export abgebrochen: {error} ({self.exporter.written} Datensätze geschrieben)")
+            messagebox.showerror("Exportfehler", f"Export abgebrochen: {error}")
+        else:
+            self.log(f"Export beendet ({self.exporter.written} Datensätze, "
+                     f"{self.exporter.dropped} verworfen)")
+    
+    def on_export_error(self, error):
+        """Writer-Thread ist an einem Schreibfehler gestorben"""
+        if self.exporter in self.stream_subscribers:
+            self.finish_export()
+    
+    def on_close(self):
+        """Beendet Hintergrund-Threads sauber und schließt die GUI"""
+        if self.exporter in self.stream_subscribers:
+            self.finish_export()
+        if self.connected:
+            self.disconnect()
+        self.root.destroy()
+                
     def log(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.log_text.insert("end", f"[{timestamp}] {message}\n")
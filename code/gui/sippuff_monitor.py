@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Monitor-Modus
+Telemetrie bei laufendem Maus-Betrieb (MONITOR:START / MONITOR:STOP)
+
+Die Firmware sendet jeden 5. Loop (~20 Hz) eine Zeile M:<Druck>,<X>,<Y>.
+Bei jedem Klick liefert sie die ausgelassenen Druck-Samples der letzten
+150 ms als MB:<ms vor dem Klick>,<Druck>,... nach und sendet danach 15 Loops
+mit voller Rate. Die Zeilen werden erst nach Klick/Scroll/Bewegung gesendet.
+
+Einfluss auf das Loop-Timing messen:  python sippuff_monitor.py <Port> [Dauer in s]
+"""
+
+import sys
+import time
+
+import serial
+
+from sippuff_diagnostics import HIST_LABELS, parse_stats
+
+BAUDRATE = 115200
+WINDOW = 5   # Sekunden pro Messfenster (abwechselnd aus/an)
+
+
+def parse_monitor(msg):
+    """M:<Druck>,<X>,<Y> -> (Druck, X, Y)"""
+    pressure, x, y = msg[2:].split(",")
+    return int(pressure), int(x), int(y)
+
+
+def parse_burst(msg):
+    """MB:<ms vor dem Klick>,<Druck>,... -> [(ms vor dem Klick, Druck)], ältestes zuerst"""
+    values = [int(v) for v in msg[3:].split(",") if v]
+    return list(zip(values[0::2], values[1::2]))
+
+
+def summarize(stats_list):
+    """Fasst mehrere STATS-Fenster zusammen (Mittel gewichtet nach Loops)"""
+    loops = sum(s['LOOPS'] for s in stats_list)
+    hist = [sum(s['HIST'][i] for s in stats_list) for i in range(len(HIST_LABELS))]
+    return {
+        'loops': loops,
+        'mean_ms': sum(s['MEAN'] * s['LOOPS'] for s in stats_list) / max(loops, 1) / 1000,
+        'max_ms': max((s['MAX'] for s in stats_list), default=0) / 1000,
+        'slow': sum(hist[3:]) / max(loops, 1),   # Anteil Loops >= 12 ms
+        'missed': sum(s['MISSED'] for s in stats_list),
+    }
+
+
+def read_stats(connection, timeout=2.0):
+    connection.write(b"GET:STATS\n")
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        line = connection.readline().decode('utf-8', errors='ignore').strip()
+        if line.startswith("STATS:"):
+            return parse_stats(line)
+    raise RuntimeError("Keine STATS-Antwort vom Arduino")
+
+
+def measure_timing(port, duration=60):
+    """Misst Loop-Timing abwechselnd ohne/mit Monitor (ABAB gegen Drift)"""
+    connection = serial.Serial(port, BAUDRATE, timeout=0.1)
+    time.sleep(2)
+    connection.write(b"MONITOR:STOP\n")
+    read_stats(connection)   # Messfenster zurücksetzen
+
+    windows = {False: [], True: []}
+    monitor_bytes = 0
+    monitor_lines = 0
+    bursts = 0
+    try:
+        for _ in range(max(duration // (2 * WINDOW), 1)):
+            for monitor in (False, True):
+                connection.write(b"MONITOR:START\n" if monitor else b"MONITOR:STOP\n")
+                end = time.time() + WINDOW
+                while time.time() < end:
+                    line = connection.readline().decode('utf-8', errors='ignore').strip()
+                    if line.startswith("M:") or line.startswith("MB:"):
+                        monitor_bytes += len(line) + 2
+                        monitor_lines += 1
+                        bursts += line.startswith("MB:")
+                windows[monitor].append(read_stats(connection))
+    finally:
+        connection.write(b"MONITOR:STOP\n")
+        connection.close()
+
+    monitor_seconds = len(windows[True]) * WINDOW
+    print(f"{'':<14}{'Loops':>8}{'Ø ms':>8}{'max ms':>8}{'≥12 ms':>9}{'Joystick ausgef.':>18}")
+    for monitor, label in ((False, "Monitor aus"), (True, "Monitor an")):
+        s = summarize(windows[monitor])
+        print(f"{label:<14}{s['loops']:>8}{s['mean_ms']:>8.2f}{s['max_ms']:>8.1f}"
+              f"{100 * s['slow']:>8.1f}%{s['missed']:>18}")
+    print(f"Monitor-Daten: {monitor_bytes / monitor_seconds:.0f} B/s, "
+          f"{monitor_lines / monitor_seconds:.1f} Zeilen/s, {bursts} Bursts")
+    return windows
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Aufruf: python sippuff_monitor.py <Port> [Dauer in s]")
+        sys.exit(2)
+    measure_timing(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 60)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Einstellungs-Schema
+Eine Tabelle beschreibt jede Einstellung: GUI-Schlüssel, Firmware-Schlüssel,
+Typ, Bereich, Standardwert, EEPROM-Offset und Darstellung in der GUI
+
+Daraus werden beim Import die Kodier-/Dekodiertabellen für das Text-Protokoll
+(SET:<KEY>:<Wert>, SETTINGS-Dump) und das Binärabbild des EEPROM-Structs
+erzeugt. Die GUI baut Slider und Checkboxen aus derselben Tabelle.
+
+Prüfung gegen die Firmware:  python sippuff_schema.py ../src/main.cpp
+"""
+
+import re
+import struct
+import sys
+
+EEPROM_MAGIC = 0xA5B8
+EEPROM_MAGIC_V1 = 0xA5B7   # Layout ohne driftTracking (26 Bytes)
+
+# Binärtypen auf dem ATmega32U4 (little-endian, kein Padding)
+BINARY_FORMATS = {'uint16_t': 'H', 'int': 'h', 'bool': '?', 'unsigned long': 'L'}
+
+
+class Setting:
+    """Eine Einstellung des Controllers"""
+
+    def __init__(self, key, firmware_key, field, ctype, minimum, maximum, default,
+                 eeprom_offset=None, group=None, label="", tooltip="", profile=True):
+        self.key = key                      # Schlüssel in GUI/Profil-JSON
+        self.firmware_key = firmware_key    # Schlüssel in SET:/SETTINGS
+        self.field = field                  # Variable bzw. Struct-Feld in main.cpp
+        self.ctype = ctype                  # C-Typ im EEPROM-Struct
+        self.minimum = minimum
+        self.maximum = maximum
+        self.default = default
+        self.eeprom_offset = eeprom_offset  # None = nicht im EEPROM
+        self.group = group                  # GUI-Block (None = kein Widget)
+        self.label = label
+        self.tooltip = tooltip
+        self.profile = profile              # Teil des Profils (sync/speichern)
+
+    @property
+    def is_bool(self):
+        return self.ctype == 'bool'
+
+    def validate(self, value):
+        """Prüft und normalisiert einen Wert, ValueError bei Verstoß"""
+        if self.is_bool:
+            if isinstance(value, str):
+                value = value.strip().upper()
+                if value not in ('0', '1', 'TRUE', 'FALSE'):
+                    raise ValueError(f"{self.key}: '{value}' ist kein Wahrheitswert")
+                return value in ('1', 'TRUE')
+            return bool(value)
+        value = int(value)
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError(f"{self.key}: {value} außerhalb {self.minimum}..{self.maximum}")
+        return value
+
+    def encode(self, value):
+        return 1 if self.is_bool and value else int(value)
+
+
+SETTINGS = (
+    Setting('click_left', 'CLICK_LEFT', 'clickLeft', 'int', 0, 400, 10, 2,
+            'click', "Linksklick (Puff):", "Pusten: Positiver Wert für Linksklick"),
+    Setting('click_double', 'CLICK_DOUBLE', 'clickDouble', 'int', 0, 400, 15, 4,
+            'click', "Doppelklick (Puff stark):", "Stärkeres Pusten: Höherer positiver Wert für Doppelklick"),
+    Setting('click_right', 'CLICK_RIGHT', 'clickRight', 'int', -400, 0, -10, 6,
+            'click', "Rechtsklick (Sip):", "Saugen: Negativer Wert für Rechtsklick"),
+    Setting('scroll_enabled', 'SCROLL', 'scrollEnabled', 'bool', 0, 1, True, 14,
+            'scroll', "Scroll aktiviert"),
+    Setting('scroll_up', 'SCROLL_UP', 'scrollUp', 'int', -400, 0, -5, 8,
+            'scroll', "Scroll Up (Sip leicht):", "Leichtes Saugen: Scrollt nach oben (sollte > Rechtsklick sein)"),
+    Setting('scroll_down', 'SCROLL_DOWN', 'scrollDown', 'int', 0, 400, 5, 10,
+            'scroll', "Scroll Down (Puff leicht):", "Leichtes Pusten: Scrollt nach unten (sollte < Linksklick sein)"),
+    Setting('scroll_speed', 'SCROLL_SPEED', 'scrollSpeed', 'int', 1, 5, 1, 12,
+            'scroll', "Scroll-Geschwindigkeit:", "Scroll-Speed: 1=langsam, 5=schnell"),
+    Setting('joystick_enabled', 'JOYSTICK', 'joystickEnabled', 'bool', 0, 1, True, 25,
+            'joystick', "Joystick aktiviert"),
+    Setting('wavelength', 'WAVELENGTH', 'wavelength', 'int', 5, 50, 15, 15,
+            'joystick', "Geschwindigkeit:", "Höher = schneller"),
+    Setting('period', 'PERIOD', 'period', 'int', 10, 100, 35, 17,
+            'joystick', "Update-Rate (ms):", "Kleiner = flüssiger (25-50 empfohlen)"),
+    Setting('deadzone', 'DEADZONE', 'joyDeadzone', 'int', 0, 100, 25, 19,
+            'joystick', "Deadzone:", "Bereich ohne Bewegung um Mittelposition"),
+    Setting('debounce', 'DEBOUNCE', 'clickDebounce', 'unsigned long', 100, 1000, 500, 21,
+            'advanced', "Debounce (ms):", "Mindestzeit zwischen Klicks"),
+    Setting('drift_tracking', 'DRIFT', 'driftTracking', 'bool', 0, 1, False, 26,
+            'advanced', "Drift-Ausgleich (Nullpunkt in Ruhe nachführen)"),
+    # Gerätewert, nicht Teil des Profils (wird von der Host-Kalibrierung gesetzt)
+    Setting('baseline', 'BASELINE', 'pressureBaseline', 'int', 0, 1023, None, profile=False),
+)
+
+# Vorberechnete Tabellen
+BY_KEY = {s.key: s for s in SETTINGS}
+BY_FIRMWARE_KEY = {s.firmware_key: s for s in SETTINGS}
+PROFILE_SETTINGS = tuple(s for s in SETTINGS if s.profile)
+DEFAULTS = {s.key: s.default for s in PROFILE_SETTINGS}
+
+# EEPROM-Struct: Magic + Felder in Offset-Reihenfolge
+_EEPROM_FIELDS = sorted((s for s in SETTINGS if s.eeprom_offset is not None),
+                        key=lambda s: s.eeprom_offset)
+EEPROM_FORMAT = '<H' + ''.join(BINARY_FORMATS[s.ctype] for s in _EEPROM_FIELDS)
+EEPROM_SIZE = struct.calcsize(EEPROM_FORMAT)
+
+
+def encode_command(key, value):
+    """Kodiert einen Wert als SET-Kommando (Bytes inkl. Zeilenende)"""
+    setting = BY_KEY[key]
+    return f"SET:{setting.firmware_key}:{setting.encode(value)}\n".encode()
+
+
+def decode_settings(raw):
+    """
+    Dekodiert einen SETTINGS-Dump ({FIRMWARE_KEY: Text}) in einem Durchlauf.
+    Gibt (Werte nach GUI-Schlüssel, Fehlerliste) zurück; unbekannte
+    Schlüssel werden ignoriert, ungültige Werte als Fehler gemeldet.
+    """
+    values = {}
+    errors = []
+    for firmware_key, text in raw.items():
+        setting = BY_FIRMWARE_KEY.get(firmware_key)
+        if setting is None:
+            continue
+        try:
+            values[setting.key] = setting.validate(text)
+        except ValueError as e:
+            errors.append(str(e))
+    return values, errors
+
+
+def encode_eeprom(values):
+    """Binärabbild des EEPROM-Structs (Settings in main.cpp)"""
+    return struct.pack(EEPROM_FORMAT, EEPROM_MAGIC,
+                       *(s.encode(values.get(s.key, s.default)) for s in _EEPROM_FIELDS))
+
+
+def decode_eeprom(data):
+    """Liest ein EEPROM-Abbild; None wenn die Magic Number nicht passt"""
+    magic, = struct.unpack_from('<H', data)
+    if magic == EEPROM_MAGIC:
+        fields = _EEPROM_FIELDS
+    elif magic == EEPROM_MAGIC_V1:
+        # Altes Abbild: Felder ab driftTracking fehlen -> Standardwert (wie in main.cpp)
+        fields = [s for s in _EEPROM_FIELDS if s.key != 'drift_tracking']
+    else:
+        return None
+    values = struct.unpack_from('<H' + ''.join(BINARY_FORMATS[s.ctype] for s in fields), data)[1:]
+    result = {s.key: s.default for s in _EEPROM_FIELDS}
+    result.update({s.key: (bool(v) if s.is_bool else v) for s, v in zip(fields, values)})
+    return result
+
+
+def check_firmware(source):
+    """Vergleicht das Schema mit main.cpp, gibt eine Liste von Abweichungen zurück"""
+    problems = []
+
+    set_block = source[source.index('PSTR("SET:")'):source.index('PSTR("GET:SETTINGS")')]
+    set_keys = set(re.findall(r'strcmp_P\(key, PSTR\("(\w+)"\)\)', set_block))
+    dump_block = source[source.index('void sendCurrentSettings()\n{'):]
+    dump_block = dump_block[:dump_block.index('SETTINGS:END')]
+    dump_keys = set(re.findall(r'Serial\.print\(F\("(\w+):"\)\)', dump_block))
+
+    schema_keys = set(BY_FIRMWARE_KEY)
+    for name, keys in (("SET-Kommandos", set_keys), ("SETTINGS-Dump", dump_keys)):
+        for key in sorted(schema_keys - keys):
+            problems.append(f"{name}: {key} fehlt in main.cpp")
+        for key in sorted(keys - schema_keys):
+            problems.append(f"{name}: {key} fehlt im Schema")
+
+    magic = re.search(r'EEPROM_MAGIC = (0x[0-9A-Fa-f]+);', source)
+    if magic is None or int(magic.group(1), 16) != EEPROM_MAGIC:
+        problems.append(f"EEPROM: Magic in main.cpp {magic and magic.group(1)}, Schema 0x{EEPROM_MAGIC:04X}")
+
+    # Struct-Layout (Offsets ohne Padding wie auf AVR)
+    struct_body = re.search(r'struct Settings\s*\{(.*?)\};', source, re.S).group(1)
+    offset = 0
+    offsets = {}
+    for ctype, field in re.findall(r'(uint16_t|unsigned long|int|bool)\s+(\w+);', struct_body):
+        offsets[field] = (offset, ctype)
+        offset += struct.calcsize('<' + BINARY_FORMATS[ctype])
+    if offset != EEPROM_SIZE:
+        problems.append(f"EEPROM: Struct hat {offset} Bytes, Schema {EEPROM_SIZE}")
+    for setting in SETTINGS:
+        if setting.eeprom_offset is None:
+            if setting.field in offsets:
+                problems.append(f"EEPROM: {setting.field} ist im Struct, aber ohne Offset im Schema")
+        elif offsets.get(setting.field) != (setting.eeprom_offset, setting.ctype):
+            problems.append(f"EEPROM: {setting.field} liegt bei {offsets.get(setting.field)}, "
+                            f"Schema erwartet {(setting.eeprom_offset, setting.ctype)}")
+
+    # Standardwerte aus resetToDefaults()
+    reset_block = source[source.index('void resetToDefaults()\n{'):]
+    reset_values = dict(re.findall(r'(\w+) = (-?\w+);', reset_block))
+    for setting in PROFILE_SETTINGS:
+        expected = str(setting.default).lower() if setting.is_bool else str(setting.default)
+        if reset_values.get(setting.field) != expected:
+            problems.append(f"Standardwert {setting.field}: main.cpp {reset_values.get(setting.field)}, "
+                            f"Schema {expected}")
+    return problems
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "../src/main.cpp"
+    with open(path, 'r', encoding='utf-8') as f:
+        problems = check_firmware(f.read())
+    for problem in problems:
+        print(f"FEHLER: {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"OK: {len(SETTINGS)} Einstellungen passen zu {path} (EEPROM {EEPROM_SIZE} Bytes)")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Sip & Puff Mouse Controller - Dauertest des Serial-Protokolls
+Schickt zufällige Kommando-Bursts (mehrere Zeilen in einem write) an den
+Arduino und misst Antwortzeit und verlorene Antworten über Stunden.
+
+Gesendet werden nur Werte, die das Gerät bereits hat (aus GET:SETTINGS),
+dazu GET:STATS, GET:SETTINGS und absichtlich zu lange Zeilen
+(erwartet: ERR:LINE_TOO_LONG). Das Verhalten des Controllers bleibt gleich.
+
+Aufruf:  python sippuff_soak.py <Port> [Dauer in s] [--seed n]
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+import serial
+
+from sippuff_schema import PROFILE_SETTINGS, decode_settings, encode_command
+
+BAUDRATE = 115200
+MAX_BURST = 8             # Kommandos pro Burst (in einem write)
+MAX_PAUSE = 0.2           # Zufällige Pause zwischen Bursts (s)
+ACK_TIMEOUT = 2.0         # Antwort fehlt -> verloren
+OVERSIZE_RATIO = 0.02     # Anteil zu langer Zeilen
+LINE_MAX = 48             # SERIAL_LINE_MAX in main.cpp
+REPORT_INTERVAL = 60      # Zwischenbericht (s)
+
+
+def expected_reply(command):
+    """Zeile, mit der der Arduino ein Kommando abschließt"""
+    if len(command) > LINE_MAX:
+        return "ERR:LINE_TOO_LONG"
+    if command.startswith("SET:"):
+        return "OK:" + command.split(":")[1]
+    if command == "GET:STATS":
+        return "STATS"
+    if command == "GET:SETTINGS":
+        return "SETTINGS:END"
+    raise ValueError(f"Keine Antwort bekannt für {command}")
+
+
+def matches(line, expected):
+    # "OK:SCROLL" darf nicht auf "OK:SCROLL_UP" passen
+    return line == expected or line.startswith(expected + ":")
+
+
+def build_burst(rng, values):
+    """Zufälliger Burst aus SET-Kommandos mit den aktuellen Gerätewerten"""
+    commands = []
+    for _ in range(rng.randint(1, MAX_BURST)):
+        roll = rng.random()
+        if roll < OVERSIZE_RATIO:
+            commands.append("SET:" + "X" * rng.randint(LINE_MAX, 3 * LINE_MAX))
+        elif roll < 0.05:
+            commands.append("GET:STATS")
+        elif roll < 0.07:
+            commands.append("GET:SETTINGS")
+        else:
+            setting = rng.choice(PROFILE_SETTINGS)
+            commands.append(encode_command(setting.key, values[setting.key]).decode().strip())
+    return commands
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class AckTracker:
+    """Ordnet Antwortzeilen den offenen Kommandos zu (Antworten kommen in Reihenfolge)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = deque()   # (erwartete Antwort, Sendezeit)
+        self.sent = 0
+        self.acked = 0
+        self.lost = 0
+        self.latencies = []      # Sekunden, seit letztem Bericht
+        self.all_latencies = []  # Sekunden, gesamter Test
+
+    def add(self, expected, t):
+        with self.lock:
+            self.pending.append((expected, t))
+            self.sent += 1
+
+    def on_line(self, line, t):
+        with self.lock:
+            for index, (expected, sent_at) in enumerate(self.pending):
+                if matches(line, expected):
+                    # Ältere offene Kommandos wurden übersprungen -> verloren
+                    for _ in range(index):
+                        self.pending.popleft()
+                    self.lost += index
+                    self.pending.popleft()
+                    self.acked += 1
+                    self.latencies.append(t - sent_at)
+                    self.all_latencies.append(t - sent_at)
+                    return
+
+    def expire(self, now):
+        with self.lock:
+            while self.pending and now - self.pending[0][1] > ACK_TIMEOUT:
+                self.pending.popleft()
+                self.lost += 1
+
+    def idle(self):
+        with self.lock:
+            return not self.pending
+
+    def report(self, elapsed, total=False):
+        """Zwischenbericht (Latenz seit letztem Bericht) oder Gesamtergebnis"""
+        with self.lock:
+            latencies = sorted(self.all_latencies if total else self.latencies)
+            self.latencies = []
+            sent, acked, lost = self.sent, self.acked, self.lost
+        return (f"[{elapsed / 60:6.1f} min] gesendet {sent}, bestätigt {acked}, verloren {lost} "
+                f"({100 * lost / max(sent, 1):.3f}%)  Latenz ms: "
+                f"p50 {1000 * percentile(latencies, 0.5):.1f} / "
+                f"p95 {1000 * percentile(latencies, 0.95):.1f} / "
+                f"p99 {1000 * percentile(latencies, 0.99):.1f} / "
+                f"max {1000 * (latencies[-1] if latencies else 0):.1f}")
+
+
+def read_settings(connection):
+    """Liest die aktuellen Geräteeinstellungen (SETTINGS-Dump)"""
+    connection.reset_input_buffer()
+    connection.write(b"GET:SETTINGS\n")
+    raw = {}
+    deadline = time.time() + 3
+    receiving = False
+    while time.time() < deadline:
+        line = connection.readline().decode('utf-8', errors='ignore').strip()
+        if line == "SETTINGS:START":
+            receiving = True
+        elif line == "SETTINGS:END" and receiving:
+            values, errors = decode_settings(raw)
+            if errors:
+                raise RuntimeError("; ".join(errors))
+            return values
+        elif receiving and ":" in line:
+            key, _, value = line.partition(":")
+            raw[key] = value
+    raise RuntimeError("Keine Einstellungen vom Arduino erhalten")
+
+
+def soak(port, duration, seed=None):
+    """Führt den Dauertest aus, gibt die Anzahl verlorener Antworten zurück"""
+    rng = random.Random(seed)
+    connection = serial.Serial(port, BAUDRATE, timeout=0.1)
+    time.sleep(2)
+    values = read_settings(connection)
+    print(f"Dauertest an {port} für {duration} s (Seed {seed})")
+
+    tracker = AckTracker()
+    running = True
+
+    def reader():
+        while running:
+            line = connection.readline().decode('utf-8', errors='ignore').strip()
+            if line:
+                tracker.on_line(line, time.perf_counter())
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+
+    start = time.perf_counter()
+    next_report = start + REPORT_INTERVAL
+    try:
+        while time.perf_counter() - start < duration:
+            commands = build_burst(rng, values)
+            now = time.perf_counter()
+            for command in commands:
+                tracker.add(expected_reply(command), now)
+            connection.write("".join(command + "\n" for command in commands).encode())
+
+            # Auf alle Antworten warten (oder Timeout), dann zufällige Pause
+            while not tracker.idle():
+                tracker.expire(time.perf_counter())
+                time.sleep(0.001)
+            time.sleep(rng.uniform(0, MAX_PAUSE))
+
+            if time.perf_counter() >= next_report:
+                print(tracker.report(time.perf_counter() - start))
+                next_report += REPORT_INTERVAL
+    except KeyboardInterrupt:
+        print("Abgebrochen")
+    finally:
+        running = False
+        thread.join(timeout=1)
+        print("Gesamt:", tracker.report(time.perf_counter() - start, total=True))
+        connection.close()
+    return tracker.lost
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Aufruf: python sippuff_soak.py <Port> [Dauer in s] [--seed n]")
+        sys.exit(2)
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else 3600
+    seed = int(sys.argv[sys.argv.index('--seed') + 1]) if '--seed' in sys.argv else None
+    sys.exit(1 if soak(sys.argv[1], duration, seed) else 0)
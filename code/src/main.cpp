@@ -17,6 +17,18 @@ const int JOY_Y_PIN = A1;    // Joystick Y-Achse
 int pressureBaseline = 0; // Nullpunkt bei Umgebungsdruck
 const int SAMPLES = 50;   // Anzahl Samples für Kalibrierung
 
+// Host-Kalibrierung: Rohwerte werden an die GUI gestreamt
+const int CAL_STREAM_MAX = 200;     // Maximale Anzahl Samples pro Anfrage
+const int CAL_STREAM_INTERVAL = 2;  // Abstand zwischen Samples in MS
+
+// Drift-Ausgleich: Nullpunkt folgt dem Sensor in Ruhephasen (über Serial änderbar, im EEPROM)
+bool driftTracking = false;
+const unsigned long DRIFT_QUIET_MS = 2000; // Ruhedauer bis zur Nachführung
+const unsigned long DRIFT_STEP_MS = 500;   // Ein Mittelungsschritt pro 0,5 s (Zeitkonstante ~2 min)
+long baselineFixed = 0;                    // Nullpunkt in Festkomma (x256)
+unsigned long quietSince = 0;
+unsigned long lastDriftStep = 0;
+
 // Klick-Schwellwerte (über Serial änderbar)
 int clickLeft = 10;   // Einfacher Linksklick (Pusten)
 int clickDouble = 15; // Doppelter Linksklick (starkes Pusten)
@@ -45,16 +57,53 @@ bool joystickEnabled = true;
 // Status-LED
 const int LED_PIN = LED_BUILTIN_TX;
 
-// Serial-Kommando-Buffer
-String serialBuffer = "";
-bool commandReady = false;
+// Serial-Kommando-Buffer (feste Größe, keine Heap-Allokation)
+const uint8_t SERIAL_LINE_MAX = 48;  // Längstes gültiges Kommando (Zeichen ohne '\n')
+char serialLine[SERIAL_LINE_MAX + 1];
+uint8_t serialLineLength = 0;
+bool serialLineOverflow = false;     // Aktuelle Zeile zu lang -> wird verworfen
 
 // Drucktest-Modus
 bool pressureTestMode = false; // Wenn true, sende kontinuierlich Druckwerte
 
+// Monitor-Modus: Telemetrie bei laufendem Maus-Betrieb (MONITOR:START/STOP)
+bool monitorMode = false;
+const uint8_t MONITOR_DIVIDER = 5;         // Jeder 5. Loop wird gesendet (~20 Hz)
+const uint8_t MONITOR_POST = 15;           // Loops mit voller Rate nach einem Klick
+const unsigned long MONITOR_PRE_MS = 150;  // Fenster vor einem Klick
+const uint8_t MONITOR_RING = 16;           // Nicht gesendete Samples für das Pre-Fenster
+
+struct MonitorSample
+{
+  unsigned long time;
+  int pressure;
+};
+MonitorSample monitorRing[MONITOR_RING];
+uint8_t monitorRingHead = 0;
+uint8_t monitorRingCount = 0;
+uint8_t monitorLoop = 0;
+uint8_t monitorPostRemaining = 0;
+unsigned long monitorLastClick = 0; // lastClickTime beim letzten Burst
+
+// Gerätestatus: Loop-Timing, Joystick-Takt und Serial-Rückstau (Abfrage über GET:STATS)
+const int HIST_BUCKETS = 8;
+const unsigned int HIST_EDGES_MS[HIST_BUCKETS - 1] = {5, 10, 12, 15, 20, 50, 100};
+unsigned int loopHistogram[HIST_BUCKETS];
+unsigned long statsWindowStart = 0; // micros() beim ersten Loop im Messfenster
+unsigned long lastLoopMicros = 0;
+unsigned long loopCount = 0;
+unsigned long loopMin = 0;
+unsigned long loopMax = 0;
+unsigned int joystickTicks = 0;
+unsigned int missedJoystickTicks = 0;
+int rxHighWater = 0;            // Max. Bytes im USB-Empfangspuffer
+unsigned int lineHighWater = 0; // Längste empfangene Kommandozeile
+unsigned int rejectedLines = 0; // Verworfene Zeilen (länger als SERIAL_LINE_MAX)
+
 // EEPROM-Speicherung
 const int EEPROM_ADDRESS = 0;
-const uint16_t EEPROM_MAGIC = 0xA5B7;
+const uint16_t EEPROM_MAGIC = 0xA5B8;
+const uint16_t EEPROM_MAGIC_V1 = 0xA5B7; // Layout ohne driftTracking
 
 struct Settings
 {
@@ -71,15 +120,26 @@ struct Settings
   int joyDeadzone;
   unsigned long clickDebounce;
   bool joystickEnabled;
+  bool driftTracking;
 };
 
 // Function Prototypes
 void calibratePressureSensor();
+void streamCalibrationSamples(int count);
+void trackBaselineDrift(int pressureRaw, int pressureDiff);
 void handleClicks(int pressureDiff);
 void handleScrolling(int pressureDiff);
 void handleMouseMovement();
+void startMonitor();
+void monitorSample(int pressureDiff);
+void sendMonitorBurst(unsigned long triggerTime);
 void blinkLED(int times);
-void processSerialCommand(String cmd);
+void recordLoopTiming();
+void recordJoystickTick(unsigned long late);
+void resetStats();
+void sendStats();
+void readSerialCommands(int available);
+void processSerialCommand(char *cmd);
 void sendCurrentSettings();
 void saveSettingsToEEPROM();
 void loadSettingsFromEEPROM();
@@ -112,6 +172,7 @@ void setup()
 
   // Timer initialisieren
   cursorFrequencyTimer = millis() + period;
+  resetStats();
 
   Serial.println(F("\n>>> Controller aktiv <<<"));
   Serial.println(F("Bereit für GUI-Verbindung\n"));
@@ -125,27 +186,17 @@ void setup()
 
 void loop()
 {
-  // Serial-Kommandos verarbeiten
-  while (Serial.available() > 0)
-  {
-    char c = Serial.read();
-    if (c == '\n')
-    {
-      commandReady = true;
-    }
-    else
-    {
-      serialBuffer += c;
-    }
-  }
+  recordLoopTiming();
 
-  if (commandReady)
+  int rxPending = Serial.available();
+  if (rxPending > rxHighWater)
   {
-    processSerialCommand(serialBuffer);
-    serialBuffer = "";
-    commandReady = false;
+    rxHighWater = rxPending;
   }
 
+  // Serial-Kommandos verarbeiten
+  readSerialCommands(rxPending);
+
   // Drucksensor auslesen
   int pressureRaw = analogRead(PRESSURE_PIN);
   int pressureDiff = pressureRaw - pressureBaseline;
@@ -159,6 +210,12 @@ void loop()
   }
   else
   {
+    // Nullpunkt in Ruhephasen nachführen
+    if (driftTracking)
+    {
+      trackBaselineDrift(pressureRaw, pressureDiff);
+    }
+
     // Normaler Betrieb: Mausklicks über Sip & Puff
     handleClicks(pressureDiff);
 
@@ -171,14 +228,58 @@ void loop()
     // Mausbewegung über Joystick
     if (joystickEnabled && millis() >= cursorFrequencyTimer)
     {
+      recordJoystickTick(millis() - cursorFrequencyTimer);
       handleMouseMovement();
       cursorFrequencyTimer = millis() + period;
     }
 
+    // Telemetrie erst nach Klick/Scroll/Bewegung, damit das HID-Timing gleich bleibt
+    if (monitorMode)
+    {
+      monitorSample(pressureDiff);
+    }
+
     delay(10);
   }
 }
 
+void readSerialCommands(int available)
+{
+  // Nur die beim Loop-Start vorhandenen Bytes lesen, damit ein Dauerstrom
+  // vom Host den Loop nicht blockiert; jede vollständige Zeile wird sofort ausgeführt
+  for (int i = 0; i < available; i++)
+  {
+    char c = Serial.read();
+    if (c == '\n')
+    {
+      if (serialLineOverflow)
+      {
+        rejectedLines++;
+        Serial.println(F("ERR:LINE_TOO_LONG"));
+      }
+      else
+      {
+        serialLine[serialLineLength] = '\0';
+        processSerialCommand(serialLine);
+      }
+      serialLineLength = 0;
+      serialLineOverflow = false;
+    }
+    else if (serialLineLength < SERIAL_LINE_MAX)
+    {
+      serialLine[serialLineLength++] = c;
+      if (serialLineLength > lineHighWater)
+      {
+        lineHighWater = serialLineLength;
+      }
+    }
+    else
+    {
+      serialLineOverflow = true;
+    }
+  }
+}
+
 void calibratePressureSensor()
 {
   Serial.println(F("Kalibriere Drucksensor..."));
@@ -197,12 +298,54 @@ void calibratePressureSensor()
   }
 
   pressureBaseline = sum / SAMPLES;
+  baselineFixed = (long)pressureBaseline * 256;
 
   Serial.println();
   Serial.print(F("Kalibrierung abgeschlossen! Nullpunkt: "));
   Serial.println(pressureBaseline);
 }
 
+void streamCalibrationSamples(int count)
+{
+  // Rohwerte in einer Zeile senden, die GUI berechnet den Nullpunkt
+  count = constrain(count, 1, CAL_STREAM_MAX);
+
+  Serial.print(F("CAL:DATA:"));
+  for (int i = 0; i < count; i++)
+  {
+    if (i > 0)
+    {
+      Serial.print(',');
+    }
+    Serial.print(analogRead(PRESSURE_PIN));
+    delay(CAL_STREAM_INTERVAL);
+  }
+  Serial.println();
+}
+
+void trackBaselineDrift(int pressureRaw, int pressureDiff)
+{
+  unsigned long currentTime = millis();
+
+  // Keine Ruhe: Druck im Scroll-/Klickbereich oder kurz nach einem Klick
+  if (pressureDiff > scrollDown || pressureDiff < scrollUp || currentTime - lastClickTime < clickDebounce)
+  {
+    quietSince = currentTime;
+    return;
+  }
+
+  if (currentTime - quietSince < DRIFT_QUIET_MS || currentTime - lastDriftStep < DRIFT_STEP_MS)
+  {
+    return;
+  }
+  lastDriftStep = currentTime;
+
+  // Langsamer gleitender Mittelwert: 256 Schritte à 0,5 s -> folgt der Erwärmungsdrift
+  // (Minuten), ein gleichmäßiger leichter Atem unter der Scroll-Schwelle bleibt erhalten
+  baselineFixed += ((long)pressureRaw * 256 - baselineFixed) / 256;
+  pressureBaseline = (baselineFixed + 128) / 256;
+}
+
 void handleClicks(int pressureDiff)
 {
   unsigned long currentTime = millis();
@@ -320,6 +463,80 @@ void handleMouseMovement()
   }
 }
 
+void startMonitor()
+{
+  monitorMode = true;
+  monitorLoop = 0;
+  monitorRingCount = 0;
+  monitorPostRemaining = 0;
+  monitorLastClick = lastClickTime;
+}
+
+void monitorSample(int pressureDiff)
+{
+  unsigned long now = millis();
+
+  // Klick in diesem Loop -> vorher ausgelassene Samples nachliefern, danach volle Rate
+  if (lastClickTime != monitorLastClick)
+  {
+    monitorLastClick = lastClickTime;
+    sendMonitorBurst(lastClickTime);
+    monitorPostRemaining = MONITOR_POST;
+  }
+
+  if (++monitorLoop >= MONITOR_DIVIDER || monitorPostRemaining > 0)
+  {
+    monitorLoop = 0;
+    if (monitorPostRemaining > 0)
+    {
+      monitorPostRemaining--;
+    }
+    Serial.print(F("M:"));
+    Serial.print(pressureDiff);
+    Serial.print(',');
+    Serial.print(analogRead(JOY_X_PIN));
+    Serial.print(',');
+    Serial.println(analogRead(JOY_Y_PIN));
+  }
+  else
+  {
+    monitorRing[monitorRingHead].time = now;
+    monitorRing[monitorRingHead].pressure = pressureDiff;
+    monitorRingHead = (monitorRingHead + 1) % MONITOR_RING;
+    if (monitorRingCount < MONITOR_RING)
+    {
+      monitorRingCount++;
+    }
+  }
+}
+
+void sendMonitorBurst(unsigned long triggerTime)
+{
+  // MB:<ms vor dem Klick>,<Druck>,... ältestes Sample zuerst, nur innerhalb MONITOR_PRE_MS
+  // (Bezug ist der Klick, nicht die Sendezeit: handleClicks blinkt vorher bis zu 250 ms)
+  Serial.print(F("MB:"));
+  bool first = true;
+  for (uint8_t i = 0; i < monitorRingCount; i++)
+  {
+    MonitorSample &sample = monitorRing[(monitorRingHead + MONITOR_RING - monitorRingCount + i) % MONITOR_RING];
+    unsigned long age = triggerTime - sample.time;
+    if (age > MONITOR_PRE_MS)
+    {
+      continue;
+    }
+    if (!first)
+    {
+      Serial.print(',');
+    }
+    first = false;
+    Serial.print(age);
+    Serial.print(',');
+    Serial.print(sample.pressure);
+  }
+  Serial.println();
+  monitorRingCount = 0;
+}
+
 void blinkLED(int times)
 {
   for (int i = 0; i < times; i++)
@@ -331,115 +548,253 @@ void blinkLED(int times)
   }
 }
 
-void processSerialCommand(String cmd)
+void recordLoopTiming()
+{
+  unsigned long now = micros();
+  unsigned long loopTime = now - lastLoopMicros;
+  lastLoopMicros = now;
+
+  // Erster Durchlauf nach dem Zurücksetzen hat keine Vorgänger-Zeit
+  if (loopCount++ == 0)
+  {
+    statsWindowStart = now;
+    return;
+  }
+
+  if (loopTime < loopMin)
+  {
+    loopMin = loopTime;
+  }
+  if (loopTime > loopMax)
+  {
+    loopMax = loopTime;
+  }
+
+  unsigned long loopMs = loopTime / 1000;
+  int bucket = 0;
+  while (bucket < HIST_BUCKETS - 1 && loopMs >= HIST_EDGES_MS[bucket])
+  {
+    bucket++;
+  }
+  if (loopHistogram[bucket] < 0xFFFF)
+  {
+    loopHistogram[bucket]++;
+  }
+}
+
+void recordJoystickTick(unsigned long late)
+{
+  // Verspätung in ganzen Perioden = ausgefallene Joystick-Updates
+  joystickTicks++;
+  if (period > 0)
+  {
+    missedJoystickTicks += late / period;
+  }
+}
+
+void resetStats()
+{
+  lastLoopMicros = micros();
+  loopCount = 0;
+  loopMin = 0xFFFFFFFF;
+  loopMax = 0;
+  for (int i = 0; i < HIST_BUCKETS; i++)
+  {
+    loopHistogram[i] = 0;
+  }
+  joystickTicks = 0;
+  missedJoystickTicks = 0;
+  rxHighWater = 0;
+  lineHighWater = 0;
+  rejectedLines = 0;
+}
+
+void sendStats()
+{
+  // Eine Zeile pro Abfrage, danach beginnt ein neues Messfenster
+  unsigned long measured = loopCount > 1 ? loopCount - 1 : 0;
+
+  Serial.print(F("STATS:LOOPS:"));
+  Serial.print(measured);
+  Serial.print(F(",MIN:"));
+  Serial.print(measured ? loopMin : 0);
+  Serial.print(F(",MEAN:"));
+  Serial.print(measured ? (lastLoopMicros - statsWindowStart) / measured : 0);
+  Serial.print(F(",MAX:"));
+  Serial.print(loopMax);
+  Serial.print(F(",HIST:"));
+  for (int i = 0; i < HIST_BUCKETS; i++)
+  {
+    if (i > 0)
+    {
+      Serial.print('/');
+    }
+    Serial.print(loopHistogram[i]);
+  }
+  Serial.print(F(",TICKS:"));
+  Serial.print(joystickTicks);
+  Serial.print(F(",MISSED:"));
+  Serial.print(missedJoystickTicks);
+  Serial.print(F(",RX:"));
+  Serial.print(rxHighWater);
+  Serial.print(F(",LINE:"));
+  Serial.print(lineHighWater);
+  Serial.print(F(",REJECTED:"));
+  Serial.println(rejectedLines);
+
+  resetStats();
+}
+
+void processSerialCommand(char *cmd)
 {
-  cmd.trim();
+  // Leerzeichen und '\r' an den Rändern entfernen
+  while (isspace(*cmd))
+  {
+    cmd++;
+  }
+  char *end = cmd + strlen(cmd);
+  while (end > cmd && isspace(end[-1]))
+  {
+    *--end = '\0';
+  }
 
-  if (cmd.startsWith("SET:"))
+  // Vergleichstexte bleiben mit PSTR() im Flash
+  if (strncmp_P(cmd, PSTR("SET:"), 4) == 0)
   {
-    String param = cmd.substring(4);
-    int separatorIndex = param.indexOf(':');
+    char *key = cmd + 4;
+    char *separator = strchr(key, ':');
 
-    if (separatorIndex > 0)
+    if (separator != NULL && separator > key)
     {
-      String key = param.substring(0, separatorIndex);
-      int value = param.substring(separatorIndex + 1).toInt();
+      *separator = '\0';
+      int value = atoi(separator + 1);
 
-      if (key == "CLICK_LEFT")
+      if (strcmp_P(key, PSTR("CLICK_LEFT")) == 0)
       {
         clickLeft = value;
         Serial.println(F("OK:CLICK_LEFT"));
       }
-      else if (key == "CLICK_DOUBLE")
+      else if (strcmp_P(key, PSTR("CLICK_DOUBLE")) == 0)
       {
         clickDouble = value;
         Serial.println(F("OK:CLICK_DOUBLE"));
       }
-      else if (key == "CLICK_RIGHT")
+      else if (strcmp_P(key, PSTR("CLICK_RIGHT")) == 0)
       {
         clickRight = value;
         Serial.println(F("OK:CLICK_RIGHT"));
       }
-      else if (key == "SCROLL_UP")
+      else if (strcmp_P(key, PSTR("SCROLL_UP")) == 0)
       {
         scrollUp = value;
         Serial.println(F("OK:SCROLL_UP"));
       }
-      else if (key == "SCROLL_DOWN")
+      else if (strcmp_P(key, PSTR("SCROLL_DOWN")) == 0)
       {
         scrollDown = value;
         Serial.println(F("OK:SCROLL_DOWN"));
       }
-      else if (key == "SCROLL_SPEED")
+      else if (strcmp_P(key, PSTR("SCROLL_SPEED")) == 0)
       {
         scrollSpeed = value;
         Serial.println(F("OK:SCROLL_SPEED"));
       }
-      else if (key == "SCROLL")
+      else if (strcmp_P(key, PSTR("SCROLL")) == 0)
       {
         scrollEnabled = (value == 1);
         Serial.print(F("OK:SCROLL:"));
         Serial.println(scrollEnabled ? "ON" : "OFF");
       }
-      else if (key == "WAVELENGTH")
+      else if (strcmp_P(key, PSTR("WAVELENGTH")) == 0)
       {
         wavelength = value;
         Serial.println(F("OK:WAVELENGTH"));
       }
-      else if (key == "PERIOD")
+      else if (strcmp_P(key, PSTR("PERIOD")) == 0)
       {
         period = value;
         Serial.println(F("OK:PERIOD"));
       }
-      else if (key == "DEADZONE")
+      else if (strcmp_P(key, PSTR("DEADZONE")) == 0)
       {
         joyDeadzone = value;
         Serial.println(F("OK:DEADZONE"));
       }
-      else if (key == "DEBOUNCE")
+      else if (strcmp_P(key, PSTR("DEBOUNCE")) == 0)
       {
         clickDebounce = value;
         Serial.println(F("OK:DEBOUNCE"));
       }
-      else if (key == "JOYSTICK")
+      else if (strcmp_P(key, PSTR("JOYSTICK")) == 0)
       {
         joystickEnabled = (value == 1);
         Serial.print(F("OK:JOYSTICK:"));
         Serial.println(joystickEnabled ? "ON" : "OFF");
       }
+      else if (strcmp_P(key, PSTR("BASELINE")) == 0)
+      {
+        pressureBaseline = value;
+        baselineFixed = (long)pressureBaseline * 256;
+        Serial.println(F("OK:BASELINE"));
+      }
+      else if (strcmp_P(key, PSTR("DRIFT")) == 0)
+      {
+        driftTracking = (value == 1);
+        quietSince = millis();
+        Serial.print(F("OK:DRIFT:"));
+        Serial.println(driftTracking ? "ON" : "OFF");
+      }
     }
   }
-  else if (cmd == "GET:SETTINGS")
+  else if (strcmp_P(cmd, PSTR("GET:SETTINGS")) == 0)
   {
     sendCurrentSettings();
   }
-  else if (cmd == "RECALIBRATE")
+  else if (strcmp_P(cmd, PSTR("GET:STATS")) == 0)
+  {
+    sendStats();
+  }
+  else if (strcmp_P(cmd, PSTR("RECALIBRATE")) == 0)
   {
     Serial.println(F("INFO:Starte Rekalibrierung..."));
     calibratePressureSensor();
     Serial.println(F("OK:RECALIBRATE"));
   }
-  else if (cmd == "PRESSURE_TEST:START")
+  else if (strncmp_P(cmd, PSTR("CALIBRATE:SAMPLES:"), 18) == 0)
+  {
+    streamCalibrationSamples(atoi(cmd + 18));
+  }
+  else if (strcmp_P(cmd, PSTR("PRESSURE_TEST:START")) == 0)
   {
     pressureTestMode = true;
     Serial.println(F("OK:PRESSURE_TEST:START"));
   }
-  else if (cmd == "PRESSURE_TEST:STOP")
+  else if (strcmp_P(cmd, PSTR("PRESSURE_TEST:STOP")) == 0)
   {
     pressureTestMode = false;
     Serial.println(F("OK:PRESSURE_TEST:STOP"));
   }
-  else if (cmd == "SAVE_EEPROM")
+  else if (strcmp_P(cmd, PSTR("MONITOR:START")) == 0)
+  {
+    startMonitor();
+    Serial.println(F("OK:MONITOR:START"));
+  }
+  else if (strcmp_P(cmd, PSTR("MONITOR:STOP")) == 0)
+  {
+    monitorMode = false;
+    Serial.println(F("OK:MONITOR:STOP"));
+  }
+  else if (strcmp_P(cmd, PSTR("SAVE_EEPROM")) == 0)
   {
     saveSettingsToEEPROM();
     Serial.println(F("OK:SAVE_EEPROM"));
   }
-  else if (cmd == "LOAD_EEPROM")
+  else if (strcmp_P(cmd, PSTR("LOAD_EEPROM")) == 0)
   {
     loadSettingsFromEEPROM();
     Serial.println(F("OK:LOAD_EEPROM"));
   }
-  else if (cmd == "RESET_DEFAULTS")
+  else if (strcmp_P(cmd, PSTR("RESET_DEFAULTS")) == 0)
   {
     resetToDefaults();
     Serial.println(F("OK:RESET_DEFAULTS"));
@@ -473,6 +828,8 @@ void sendCurrentSettings()
   Serial.println(clickDebounce);
   Serial.print(F("JOYSTICK:"));
   Serial.println(joystickEnabled ? "1" : "0");
+  Serial.print(F("DRIFT:"));
+  Serial.println(driftTracking ? "1" : "0");
   Serial.print(F("BASELINE:"));
   Serial.println(pressureBaseline);
   Serial.println(F("SETTINGS:END"));
@@ -497,6 +854,7 @@ void saveSettingsToEEPROM()
   settings.joyDeadzone = joyDeadzone;
   settings.clickDebounce = clickDebounce;
   settings.joystickEnabled = joystickEnabled;
+  settings.driftTracking = driftTracking;
 
   EEPROM.put(EEPROM_ADDRESS, settings);
 
@@ -512,7 +870,7 @@ void loadSettingsFromEEPROM()
   EEPROM.get(EEPROM_ADDRESS, settings);
 
   // Prüfe Magic Number
-  if (settings.magic == EEPROM_MAGIC)
+  if (settings.magic == EEPROM_MAGIC || settings.magic == EEPROM_MAGIC_V1)
   {
     // Gültige Einstellungen gefunden
     clickLeft = settings.clickLeft;
@@ -527,6 +885,8 @@ void loadSettingsFromEEPROM()
     joyDeadzone = settings.joyDeadzone;
     clickDebounce = settings.clickDebounce;
     joystickEnabled = settings.joystickEnabled;
+    // Altes Abbild: Byte nach dem Struct ist nicht beschrieben -> Drift bleibt aus
+    driftTracking = settings.magic == EEPROM_MAGIC && settings.driftTracking;
 
     Serial.println(F("INFO:Gespeicherte Einstellungen geladen!"));
     blinkLED(2);
@@ -557,6 +917,7 @@ void resetToDefaults()
   joyDeadzone = 25;
   clickDebounce = 500;
   joystickEnabled = true;
+  driftTracking = false;
 
   saveSettingsToEEPROM();
 